@@ -6,12 +6,40 @@ import pandas as pd
 import numpy as np
 import requests
 import logging
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import time
 
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from apps.analytics.indicators import (
+    hold_until_exit,
+    rolling_mean,
+    rolling_mean_std,
+    score_returns,
+    wilder_rsi
+)
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("Backtester")
 
+# Seconds per candle for the epoch-aligned Binance intervals (used for cache expiry)
+_TIMEFRAME_UNIT_SECONDS = {'m': 60, 'h': 3600, 'd': 86400}
+
+DEFAULT_CACHE_DIR = Path.home() / '.cache' / 'trading-bot' / 'klines'
+
+
+def timeframe_to_seconds(timeframe: str) -> Optional[int]:
+    """Convert '1m', '4h', '1d'... to seconds (None for unsupported intervals)."""
+    count, unit = timeframe[:-1], timeframe[-1:]
+    if not count.isdigit() or unit not in _TIMEFRAME_UNIT_SECONDS:
+        return None
+    return int(count) * _TIMEFRAME_UNIT_SECONDS[unit]
+
 class Backtester:
     """
     Rapid backtesting engine for technical indicators.
@@ -22,14 +50,106 @@ class Backtester:
     # If this fails, we can fall back to mocking data for demonstration
     BASE_URL = "https://api.binance.us/api/v3/klines"
 
-    def __init__(self, symbol: str, timeframe: str = '1h', limit: int = 1000):
+    def __init__(
+        self,
+        symbol: str,
+        timeframe: str = '1h',
+        limit: int = 1000,
+        cache_dir: Optional[Path] = None,
+        use_cache: bool = True
+    ):
         self.symbol = symbol.replace('/', '').upper()
         self.timeframe = timeframe
         self.limit = limit
         self.df = pd.DataFrame()
 
+        # On-disk kline cache (parquet), valid until the next candle closes
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+        self.use_cache = use_cache
+
+        # Price arrays used by the strategy kernels (filled when data loads)
+        self._close = np.empty(0, dtype=np.float64)
+        self._pct_next = np.empty(0, dtype=np.float64)
+
+        # Indicator caches: the optimizer re-runs strategies over the same
+        # price series, so each rolling series is computed once per window.
+        self._rsi_cache: Dict[int, np.ndarray] = {}
+        self._ma_cache: Dict[int, np.ndarray] = {}
+        self._bb_cache: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+
+    @classmethod
+    def from_close(
+        cls,
+        symbol: str,
+        close: np.ndarray,
+        timeframe: str = '1h',
+        limit: Optional[int] = None
+    ) -> 'Backtester':
+        """Build a backtester over an already-fetched close series (e.g. in optimizer workers)."""
+        bt = cls(symbol, timeframe, limit or len(close))
+        bt.df = pd.DataFrame({'close': close}, copy=False)
+        bt._reset_cache()
+        return bt
+
+    def _reset_cache(self):
+        """Refresh price arrays and drop cached indicators (call whenever self.df is replaced)."""
+        self._rsi_cache.clear()
+        self._ma_cache.clear()
+        self._bb_cache.clear()
+
+        close = self.df['close'].to_numpy(np.float64)
+        self._close = close
+
+        # Strategy takes position at close of signal candle, realizes return on next candle.
+        # This is a constant of the data, so it is computed once per load, not per backtest.
+        pct_next = np.zeros(len(close))
+        np.divide(close[1:], close[:-1], out=pct_next[:-1])
+        pct_next[:-1] -= 1
+        self._pct_next = pct_next
+
+    def _cache_path(self) -> Path:
+        return self.cache_dir / f"{self.symbol}_{self.timeframe}_{self.limit}.parquet"
+
+    def _load_cached(self) -> Optional[pd.DataFrame]:
+        """Return cached klines if they were saved after the last candle close."""
+        bar_seconds = timeframe_to_seconds(self.timeframe)
+        path = self._cache_path()
+        if not self.use_cache or bar_seconds is None or not path.exists():
+            return None
+
+        now = time.time()
+        last_bar_close = now - (now % bar_seconds)
+        if path.stat().st_mtime < last_bar_close:
+            return None
+
+        try:
+            return pd.read_parquet(path)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable kline cache {path}: {e}")
+            return None
+
+    def _store_cached(self):
+        """Save the current klines to the on-disk cache (best effort)."""
+        if not self.use_cache or timeframe_to_seconds(self.timeframe) is None:
+            return
+
+        path = self._cache_path()
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self.df.to_parquet(path, index=False)
+        except Exception as e:
+            # e.g. no parquet engine (pyarrow) installed
+            logger.warning(f"Could not write kline cache {path}: {e}")
+
     def fetch_data(self):
-        """Fetch historical OHLCV data from Binance."""
+        """Fetch historical OHLCV data from Binance (served from disk cache when fresh)."""
+        cached = self._load_cached()
+        if cached is not None:
+            self.df = cached
+            self._reset_cache()
+            logger.info(f"Loaded {len(self.df)} cached candles for {self.symbol}")
+            return self.df
+
         params = {
             'symbol': self.symbol,
             'interval': self.timeframe,
@@ -63,6 +183,8 @@ class Backtester:
             cols = ['open', 'high', 'low', 'close', 'volume']
             self.df[cols] = self.df[cols].astype(float)
             self.df['timestamp'] = pd.to_datetime(self.df['timestamp'], unit='ms')
+            self._reset_cache()
+            self._store_cached()
 
             logger.info(f"Loaded {len(self.df)} candles for {self.symbol}")
             return self.df
@@ -89,8 +211,33 @@ class Backtester:
             'close': price_path * (1 + np.random.normal(0, 0.005, self.limit)),
             'volume': np.random.randint(100, 10000, self.limit)
         })
+        self._reset_cache()
         return self.df
 
+    def _get_rsi(self, period: int) -> np.ndarray:
+        """RSI for the given period (memoized)."""
+        rsi = self._rsi_cache.get(period)
+        if rsi is None:
+            rsi = wilder_rsi(self._close, period)
+            self._rsi_cache[period] = rsi
+        return rsi
+
+    def _get_ma(self, period: int) -> np.ndarray:
+        """Simple moving average of close for the given window (memoized)."""
+        ma = self._ma_cache.get(period)
+        if ma is None:
+            ma = rolling_mean(self._close, period)
+            self._ma_cache[period] = ma
+        return ma
+
+    def _get_bb(self, period: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Bollinger middle band and rolling std for the given window (memoized)."""
+        bb = self._bb_cache.get(period)
+        if bb is None:
+            bb = rolling_mean_std(self._close, period)
+            self._bb_cache[period] = bb
+        return bb
+
     def run_momentum(self, rsi_period: int = 14, ma_fast: int = 10, ma_slow: int = 30) -> Dict:
         """
         Backtest Momentum Strategy (RSI + MA Crossover).
@@ -99,108 +246,174 @@ class Backtester:
         if self.df.empty:
             self.fetch_data()
 
-        df = self.df.copy()
-
-        # Calculate Indicators
-        # RSI
-        delta = df['close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=rsi_period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=rsi_period).mean()
-        rs = gain / loss
-        df['rsi'] = 100 - (100 / (1 + rs))
-
-        # MAs
-        df['ma_fast'] = df['close'].rolling(window=ma_fast).mean()
-        df['ma_slow'] = df['close'].rolling(window=ma_slow).mean()
-
+        return self.momentum_metrics(
+            self._pct_next,
+            self._get_rsi(rsi_period),
+            self._get_ma(ma_fast),
+            self._get_ma(ma_slow),
+            self.limit
+        )
+
+    @staticmethod
+    def momentum_metrics(
+        pct_next: np.ndarray,
+        rsi: np.ndarray,
+        fast: np.ndarray,
+        slow: np.ndarray,
+        limit: int
+    ) -> Dict:
+        """Score the momentum rules over precomputed indicator arrays (no instance state)."""
         # Signals
         # Buy: Fast > Slow AND RSI > 50 (Momentum)
-        df['signal'] = 0
-        df.loc[(df['ma_fast'] > df['ma_slow']) & (df['rsi'] > 50), 'signal'] = 1
-
-        # Sell: Fast < Slow OR RSI < 50
-        df.loc[(df['ma_fast'] < df['ma_slow']) | (df['rsi'] < 50), 'signal'] = -1
-
-        # Calculate Returns
-        # Strategy takes position at close of signal candle, realizes return on next candle
-        df['pct_change'] = df['close'].pct_change().shift(-1)
+        # Sell: Fast < Slow OR RSI < 50 (sell wins when both apply)
+        buy_mask = (fast > slow) & (rsi > 50)
+        sell_mask = (fast < slow) | (rsi < 50)
+        signal = np.where(sell_mask, -1, np.where(buy_mask, 1, 0)).astype(np.int8)
 
         # Strategy Return: Long only (Spot)
         # If signal is 1, we hold. If -1 or 0, we are cash (return 0).
-        df['strategy_return'] = df['pct_change'] * (df['signal'] > 0).astype(int)
+        return Backtester.score_signals(pct_next, signal, signal > 0, limit)
+
+    def run_momentum_grid(
+        self,
+        rsi_periods: List[int],
+        ma_fasts: List[int],
+        ma_slows: List[int]
+    ) -> Dict[str, np.ndarray]:
+        """
+        Score every (rsi_period, ma_fast, ma_slow) combination at once.
 
-        return self._calculate_metrics(df)
+        The momentum strategy is path-independent (the position on each candle
+        depends only on that candle's indicators), so the whole grid can be
+        evaluated as one (R, pairs, N) tensor instead of one backtest per combo.
 
-    def run_mean_reversion(self, rsi_period: int = 14, bb_period: int = 20, bb_std: float = 2.0) -> Dict:
-        """
-        Backtest Mean Reversion Strategy (Bollinger Bands + RSI).
+        Returns:
+            Dict of (R, F, S) arrays with the same keys as run_momentum, plus
+            'valid' (False where ma_fast >= ma_slow).
         """
         if self.df.empty:
             self.fetch_data()
 
-        df = self.df.copy()
+        # Only (fast, slow) pairs with fast < slow are evaluated: with the
+        # slow windows sorted, the first valid slow for each fast window is a
+        # binary search away, so invalid pairs never enter the tensor.
+        fasts = np.asarray(ma_fasts)
+        slows = np.asarray(ma_slows)
+        slow_order = np.argsort(slows, kind='stable')
+        slows_sorted = slows[slow_order]
+        pair_f, pair_s = [], []
+        for f_idx, fast_window in enumerate(fasts):
+            start = np.searchsorted(slows_sorted, fast_window, side='right')
+            pair_f.extend([f_idx] * (len(slows_sorted) - start))
+            pair_s.extend(slow_order[start:])
+        pair_f = np.asarray(pair_f, dtype=np.intp)
+        pair_s = np.asarray(pair_s, dtype=np.intp)
+
+        grid_shape = (len(rsi_periods), len(fasts), len(slows))
+        valid = np.zeros(grid_shape, dtype=bool)
+        valid[:, pair_f, pair_s] = True
+        scores = {
+            'total_return': np.zeros(grid_shape),
+            'annualized_return': np.zeros(grid_shape),
+            'sharpe_ratio': np.zeros(grid_shape),
+            'max_drawdown': np.zeros(grid_shape),
+            'trades': np.zeros(grid_shape, dtype=np.int64),
+            'valid': valid
+        }
+        if not len(pair_f):
+            return scores
 
-        # RSI
-        delta = df['close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=rsi_period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=rsi_period).mean()
-        rs = gain / loss
-        df['rsi'] = 100 - (100 / (1 + rs))
+        rsi = np.stack([self._get_rsi(p) for p in rsi_periods])      # (R, N)
+        fast = np.stack([self._get_ma(w) for w in fasts])[pair_f]     # (P, N)
+        slow = np.stack([self._get_ma(w) for w in slows])[pair_s]     # (P, N)
 
-        # Bollinger Bands
-        df['bb_mid'] = df['close'].rolling(window=bb_period).mean()
-        df['bb_std'] = df['close'].rolling(window=bb_period).std()
-        df['bb_upper'] = df['bb_mid'] + (df['bb_std'] * bb_std)
-        df['bb_lower'] = df['bb_mid'] - (df['bb_std'] * bb_std)
+        # Buy: Fast > Slow AND RSI > 50 / Sell: Fast < Slow OR RSI < 50
+        # A buy candle can never also be a sell candle, so "long" == buy.
+        buy = (fast > slow)[None] & (rsi > 50)[:, None, :]            # (R, P, N)
+        sell = (fast < slow)[None] | (rsi < 50)[:, None, :]
 
-        # Signals
-        # Buy: Price < Lower Band AND RSI < 30
-        df['signal'] = 0
-        df.loc[(df['close'] < df['bb_lower']) & (df['rsi'] < 30), 'signal'] = 1
+        scores['trades'][:, pair_f, pair_s] = np.count_nonzero(buy | sell, axis=-1)
+        del sell
 
-        # Sell: Price > Upper Band OR RSI > 70
-        df.loc[(df['close'] > df['bb_upper']) | (df['rsi'] > 70), 'signal'] = -1
+        strategy_return = buy * self._pct_next                       # (R, P, N)
+        del buy
+        cum_return = np.cumprod(1 + strategy_return, axis=-1)
 
-        # Position Management (Stateful logic needed for mean reversion holding)
-        # Vectorized approximation:
-        # If we bought, hold until sell signal.
-        # Use ffill to propagate '1' (holding) forward until '-1' (sell).
-        df['position'] = df['signal'].replace(0, np.nan)
-        df['position'] = df['position'].ffill().fillna(0)
+        total_return = cum_return[..., -1] - 1
+        mean = strategy_return.mean(axis=-1)
+        std = strategy_return.std(axis=-1, ddof=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            sharpe = np.where(std == 0, 0.0, mean / std * np.sqrt(365 * 24))
 
-        # Strategy Return
-        df['pct_change'] = df['close'].pct_change().shift(-1)
-        df['strategy_return'] = df['pct_change'] * (df['position'] == 1).astype(int)
+        cum_max = np.maximum.accumulate(cum_return, axis=-1)
+        max_drawdown = ((cum_return - cum_max) / cum_max).min(axis=-1)
 
-        return self._calculate_metrics(df)
+        scores['total_return'][:, pair_f, pair_s] = total_return
+        scores['annualized_return'][:, pair_f, pair_s] = total_return * (365 * 24 / self.limit)
+        scores['sharpe_ratio'][:, pair_f, pair_s] = sharpe
+        scores['max_drawdown'][:, pair_f, pair_s] = max_drawdown
 
-    def _calculate_metrics(self, df: pd.DataFrame) -> Dict:
-        """Calculate performance metrics."""
-        # Fill NaN returns with 0
-        df['strategy_return'] = df['strategy_return'].fillna(0)
+        return scores
 
-        df['cum_return'] = (1 + df['strategy_return']).cumprod()
+    def run_mean_reversion(self, rsi_period: int = 14, bb_period: int = 20, bb_std: float = 2.0) -> Dict:
+        """
+        Backtest Mean Reversion Strategy (Bollinger Bands + RSI).
+        """
+        if self.df.empty:
+            self.fetch_data()
 
-        total_return = df['cum_return'].iloc[-1] - 1 if not df.empty else 0
-        annualized_return = total_return * (365 * 24 / self.limit) # Approx
+        bb_mid, bb_sigma = self._get_bb(bb_period)
+        return self.mean_reversion_metrics(
+            self._close,
+            self._pct_next,
+            self._get_rsi(rsi_period),
+            bb_mid,
+            bb_sigma,
+            bb_std,
+            self.limit
+        )
+
+    @staticmethod
+    def mean_reversion_metrics(
+        close: np.ndarray,
+        pct_next: np.ndarray,
+        rsi: np.ndarray,
+        bb_mid: np.ndarray,
+        bb_sigma: np.ndarray,
+        bb_std: float,
+        limit: int
+    ) -> Dict:
+        """Score the mean reversion rules over precomputed indicator arrays (no instance state)."""
+        bb_upper = bb_mid + (bb_sigma * bb_std)
+        bb_lower = bb_mid - (bb_sigma * bb_std)
+
+        # Signals
+        # Buy: Price < Lower Band AND RSI < 30
+        # Sell: Price > Upper Band OR RSI > 70 (sell wins when both apply)
+        buy_mask = (close < bb_lower) & (rsi < 30)
+        sell_mask = (close > bb_upper) | (rsi > 70)
+        signal = np.where(sell_mask, -1, np.where(buy_mask, 1, 0)).astype(np.int8)
+
+        # Position Management (Stateful logic needed for mean reversion holding)
+        # If we bought, hold until sell signal, then go flat.
+        position = hold_until_exit(signal)
 
-        # Sharpe Ratio (assuming risk-free rate 0)
-        if df['strategy_return'].std() == 0:
-            sharpe = 0
-        else:
-            sharpe = (df['strategy_return'].mean() / df['strategy_return'].std()) * np.sqrt(365 * 24)
+        return Backtester.score_signals(pct_next, signal, position == 1, limit)
 
-        # Max Drawdown
-        cum_max = df['cum_return'].cummax()
-        drawdown = (df['cum_return'] - cum_max) / cum_max
-        max_drawdown = drawdown.min()
+    @staticmethod
+    def score_signals(pct_next: np.ndarray, signal: np.ndarray, in_market: np.ndarray, limit: int) -> Dict:
+        """Calculate performance metrics from a signal array and its in-market mask."""
+        total_return, sharpe, max_drawdown, trades = score_returns(
+            pct_next, in_market, signal, 365 * 24
+        )
+        annualized_return = total_return * (365 * 24 / limit) # Approx
 
         return {
             'total_return': total_return,
             'annualized_return': annualized_return,
             'sharpe_ratio': sharpe,
             'max_drawdown': max_drawdown,
-            'trades': df['signal'].abs().sum()
+            'trades': trades
         }
 
 if __name__ == "__main__":
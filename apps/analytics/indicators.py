@@ -0,0 +1,374 @@
+"""
+Indicator Kernels - Array-based indicators for the backtester and the live strategies
+Compiled with Numba when available; plain NumPy/Python otherwise.
+"""
+import numpy as np
+import pandas as pd
+
+try:
+    import bottleneck as bn
+except ImportError:
+    bn = None
+
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        """Fallback decorator: run kernels as plain Python when numba is missing."""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing rolling mean (NaN until the window is full)."""
+    if bn is not None:
+        return bn.move_mean(values, window, min_count=window)
+    return pd.Series(values).rolling(window=window).mean().to_numpy()
+
+
+@njit(cache=True)
+def rolling_mean_std(values: np.ndarray, window: int):
+    """
+    Trailing rolling mean and sample std (ddof=1) in one pass.
+
+    Uses Welford's update, adding the incoming value and dropping the one
+    that leaves the window, so both outputs come from a single read of the
+    input. Values before index `window - 1` are NaN.
+
+    Returns:
+        (mean, std) arrays
+    """
+    n = values.shape[0]
+    mean_out = np.full(n, np.nan)
+    std_out = np.full(n, np.nan)
+    if window < 1 or n < window:
+        return mean_out, std_out
+
+    mean = 0.0
+    m2 = 0.0
+    for i in range(window):
+        x = values[i]
+        delta = x - mean
+        mean += delta / (i + 1)
+        m2 += delta * (x - mean)
+    mean_out[window - 1] = mean
+    if window > 1:
+        std_out[window - 1] = np.sqrt(max(m2, 0.0) / (window - 1))
+
+    for i in range(window, n):
+        x_new = values[i]
+        x_old = values[i - window]
+        prev_mean = mean
+        mean += (x_new - x_old) / window
+        m2 += (x_new - x_old) * (x_new - mean + x_old - prev_mean)
+        mean_out[i] = mean
+        if window > 1:
+            std_out[i] = np.sqrt(max(m2, 0.0) / (window - 1))
+
+    return mean_out, std_out
+
+
+@njit(cache=True)
+def wilder_rsi(close: np.ndarray, period: int) -> np.ndarray:
+    """
+    RSI with Wilder smoothing, computed in a single pass.
+
+    The first average gain/loss is the simple mean of the first `period`
+    deltas; after that avg = (avg * (period - 1) + x) / period.
+    Values before index `period` are NaN.
+    """
+    n = close.shape[0]
+    rsi = np.full(n, np.nan)
+    if n <= period:
+        return rsi
+
+    avg_gain = 0.0
+    avg_loss = 0.0
+    for i in range(1, period + 1):
+        d = close[i] - close[i - 1]
+        if d > 0:
+            avg_gain += d
+        else:
+            avg_loss -= d
+    avg_gain /= period
+    avg_loss /= period
+
+    for i in range(period, n):
+        if i > period:
+            d = close[i] - close[i - 1]
+            g = d if d > 0 else 0.0
+            l = -d if d < 0 else 0.0
+            avg_gain = (avg_gain * (period - 1) + g) / period
+            avg_loss = (avg_loss * (period - 1) + l) / period
+
+        if avg_loss == 0:
+            rsi[i] = 100.0
+        else:
+            rsi[i] = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+    return rsi
+
+
+@njit(cache=True)
+def simple_rsi(close: np.ndarray, period: int) -> np.ndarray:
+    """
+    RSI from simple rolling means of gains and losses (the live strategies' variant).
+
+    Matches pandas' diff().where(...).rolling(period).mean(): the first delta
+    counts as 0, so values start at index `period - 1`. Running sums add the
+    incoming delta and drop the one leaving the window; a count of nonzero
+    losses keeps "no losses in the window" exact (RSI 100, or NaN when flat).
+    """
+    n = close.shape[0]
+    rsi = np.full(n, np.nan)
+    if period < 1 or n < period:
+        return rsi
+
+    gains = np.zeros(n)
+    losses = np.zeros(n)
+    for i in range(1, n):
+        d = close[i] - close[i - 1]
+        if d > 0:
+            gains[i] = d
+        elif d < 0:
+            losses[i] = -d
+
+    gain_sum = 0.0
+    loss_sum = 0.0
+    gain_count = 0
+    loss_count = 0
+    for i in range(n):
+        gain_sum += gains[i]
+        loss_sum += losses[i]
+        gain_count += gains[i] > 0
+        loss_count += losses[i] > 0
+        if i >= period:
+            gain_sum -= gains[i - period]
+            loss_sum -= losses[i - period]
+            gain_count -= gains[i - period] > 0
+            loss_count -= losses[i - period] > 0
+        if i < period - 1:
+            continue
+
+        if loss_count == 0:
+            rsi[i] = 100.0 if gain_count > 0 else np.nan
+        elif gain_count == 0:
+            rsi[i] = 0.0
+        else:
+            rsi[i] = 100.0 - 100.0 / (1.0 + gain_sum / loss_sum)
+
+    return rsi
+
+
+@njit(cache=True)
+def average_true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int) -> np.ndarray:
+    """
+    ATR as the simple rolling mean of true range.
+
+    True range needs the previous close, so bar 0 has none and values start
+    at index `period`. The window sum is updated in place, one bar in and
+    one bar out.
+    """
+    n = close.shape[0]
+    atr = np.full(n, np.nan)
+    if period < 1 or n <= period:
+        return atr
+
+    tr = np.empty(n)
+    tr_sum = 0.0
+    for i in range(1, n):
+        prev_close = close[i - 1]
+        tr[i] = max(high[i] - low[i], abs(high[i] - prev_close), abs(low[i] - prev_close))
+        tr_sum += tr[i]
+        if i > period:
+            tr_sum -= tr[i - period]
+        if i >= period:
+            atr[i] = tr_sum / period
+
+    return atr
+
+
+@njit(cache=True)
+def ema(values: np.ndarray, span: int) -> np.ndarray:
+    """Exponential moving average seeded with the first value (pandas ewm(span, adjust=False))."""
+    n = values.shape[0]
+    out = np.empty(n)
+    if n == 0:
+        return out
+    alpha = 2.0 / (span + 1.0)
+    acc = values[0]
+    out[0] = acc
+    for i in range(1, n):
+        acc += alpha * (values[i] - acc)
+        out[i] = acc
+    return out
+
+
+@njit(cache=True)
+def last_mean(values: np.ndarray, window: int) -> float:
+    """Mean of the trailing `window` values (the last point of rolling_mean), NaN if too short."""
+    n = values.shape[0]
+    if window < 1 or n < window:
+        return np.nan
+    total = 0.0
+    for i in range(n - window, n):
+        total += values[i]
+    return total / window
+
+
+@njit(cache=True)
+def last_mean_std(values: np.ndarray, window: int):
+    """
+    Mean and sample std (ddof=1) of the trailing `window` values.
+
+    The last point of rolling_mean_std, reading only the window instead of
+    the whole series. Returns (NaN, NaN) if there are fewer than `window`
+    values; std is NaN when window is 1.
+    """
+    n = values.shape[0]
+    if window < 1 or n < window:
+        return np.nan, np.nan
+    mean = last_mean(values, window)
+    if window == 1:
+        return mean, np.nan
+    m2 = 0.0
+    for i in range(n - window, n):
+        d = values[i] - mean
+        m2 += d * d
+    return mean, np.sqrt(m2 / (window - 1))
+
+
+@njit(cache=True)
+def last_simple_rsi(close: np.ndarray, period: int) -> float:
+    """
+    The last point of simple_rsi, from the trailing `period` deltas only.
+
+    Bar 0 has no delta, so when the series is exactly `period` long the
+    window holds period - 1 real deltas, as in simple_rsi.
+    """
+    n = close.shape[0]
+    if period < 1 or n < period:
+        return np.nan
+
+    gain_sum = 0.0
+    loss_sum = 0.0
+    for i in range(max(n - period, 1), n):
+        d = close[i] - close[i - 1]
+        if d > 0:
+            gain_sum += d
+        elif d < 0:
+            loss_sum -= d
+
+    if loss_sum == 0:
+        return 100.0 if gain_sum > 0 else np.nan
+    if gain_sum == 0:
+        return 0.0
+    return 100.0 - 100.0 / (1.0 + gain_sum / loss_sum)
+
+
+@njit(cache=True)
+def last_average_true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int) -> float:
+    """
+    The last point of average_true_range, from the trailing `period` bars only.
+
+    NaN unless there are more than `period` bars (bar 0 has no true range).
+    """
+    n = close.shape[0]
+    if period < 1 or n <= period:
+        return np.nan
+    tr_sum = 0.0
+    for i in range(n - period, n):
+        prev_close = close[i - 1]
+        tr_sum += max(high[i] - low[i], abs(high[i] - prev_close), abs(low[i] - prev_close))
+    return tr_sum / period
+
+
+@njit(cache=True)
+def hold_until_exit(signal: np.ndarray) -> np.ndarray:
+    """
+    Turn entry/exit signals into a long-only position series.
+
+    A 1 opens (or keeps) the position, a -1 closes it, and 0 carries the
+    previous state forward.
+    """
+    position = np.empty_like(signal)
+    pos = 0
+    for i in range(signal.shape[0]):
+        if signal[i] == 1:
+            pos = 1
+        elif signal[i] == -1:
+            pos = 0
+        position[i] = pos
+    return position
+
+
+@njit(cache=True)
+def score_returns(pct_next: np.ndarray, in_market: np.ndarray, signal: np.ndarray, bars_per_year: float):
+    """
+    Score a backtest in a single pass over the candles.
+
+    Strategy return on each candle is pct_next while in the market, else 0.
+    Mean/variance use Welford's update (sample variance, ddof=1) and the
+    equity curve, its running peak and the worst drawdown are tracked in
+    the same loop.
+
+    Returns:
+        (total_return, sharpe, max_drawdown, trades)
+    """
+    n = pct_next.shape[0]
+    mean = 0.0
+    m2 = 0.0
+    equity = 1.0
+    peak = 1.0
+    max_drawdown = 0.0
+    trades = 0
+
+    for i in range(n):
+        r = pct_next[i] if in_market[i] else 0.0
+
+        delta = r - mean
+        mean += delta / (i + 1)
+        m2 += delta * (r - mean)
+
+        equity *= 1.0 + r
+        if equity > peak:
+            peak = equity
+        drawdown = (equity - peak) / peak
+        if drawdown < max_drawdown:
+            max_drawdown = drawdown
+
+        if signal[i] != 0:
+            trades += 1
+
+    sharpe = 0.0
+    if n > 1:
+        std = np.sqrt(m2 / (n - 1))
+        if std != 0:
+            sharpe = mean / std * np.sqrt(bars_per_year)
+
+    return equity - 1.0, sharpe, max_drawdown, trades
+
+
+def _warm_up():
+    """
+    Compile (or load from cache) the live-strategy kernels at import, not on the first signal check.
+
+    Numba specializes on whether an array is writable, and arrays taken from
+    pandas under copy-on-write are read-only, so both variants are compiled.
+    """
+    writable = np.linspace(1.0, 2.0, 32)
+    read_only = writable.copy()
+    read_only.flags.writeable = False
+    for prices in (writable, read_only):
+        rolling_mean_std(prices, 4)
+        simple_rsi(prices, 4)
+        average_true_range(prices, prices, prices, 4)
+        ema(prices, 4)
+        last_mean(prices, 4)
+        last_mean_std(prices, 4)
+        last_simple_rsi(prices, 4)
+        last_average_true_range(prices, prices, prices, 4)
+
+
+_warm_up()
@@ -4,8 +4,12 @@ Finds the best parameters to maximize Risk-Adjusted Returns (Sharpe Ratio).
 """
 import logging
 import itertools
+import os
 import pandas as pd
-from typing import Dict, List, Any
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+from typing import Dict, List, Any, Optional
 
 import sys
 from pathlib import Path
@@ -19,17 +23,93 @@ from apps.analytics.backtester import Backtester
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("Optimizer")
 
+# Per-process backtester used by grid workers (set by _init_worker)
+_worker_backtester: Optional[Backtester] = None
+# Keeps the shared close buffer mapped for the worker's lifetime
+_worker_shm: Optional[shared_memory.SharedMemory] = None
+
+
+def _init_worker(symbol: str, shm_name: str, length: int, timeframe: str, limit: int):
+    """Pool initializer: map the parent's close series from shared memory instead of unpickling a copy."""
+    global _worker_backtester, _worker_shm
+    _worker_shm = shared_memory.SharedMemory(name=shm_name)
+    close = np.ndarray((length,), dtype=np.float64, buffer=_worker_shm.buf)
+    _worker_backtester = Backtester.from_close(symbol, close, timeframe, limit)
+
+
+def _run_one(method: str, params: Dict[str, Any]) -> Dict:
+    """Run a single grid point in a worker process."""
+    return getattr(_worker_backtester, method)(**params)
+
+
 class StrategyOptimizer:
     """
     Grid Search Optimizer for Trading Strategies.
     """
 
-    def __init__(self, symbol: str, timeframe: str = '1h', limit: int = 1000):
+    def __init__(
+        self,
+        symbol: str,
+        timeframe: str = '1h',
+        limit: int = 1000,
+        max_workers: Optional[int] = None
+    ):
+        """
+        Args:
+            symbol: Trading pair
+            timeframe: Candle timeframe
+            limit: Number of candles to backtest on
+            max_workers: Worker processes for the grid (defaults to CPU count, 1 = in-process)
+        """
         self.symbol = symbol
+        self.timeframe = timeframe
+        self.limit = limit
+        self.max_workers = max_workers or os.cpu_count() or 1
         self.backtester = Backtester(symbol, timeframe, limit)
         # Fetch data once
         self.backtester.fetch_data()
 
+    def _evaluate_grid(self, method: str, grid: List[Dict[str, Any]], progress_every: int) -> List[Dict]:
+        """
+        Run a backtester method for every parameter set in the grid.
+
+        Grid points are independent, so they are fanned out over a process
+        pool. Results are returned in grid order regardless of completion order.
+        """
+        total = len(grid)
+
+        if self.max_workers == 1:
+            results = []
+            for count, params in enumerate(grid, 1):
+                results.append(getattr(self.backtester, method)(**params))
+                if count % progress_every == 0:
+                    print(f"Progress: {count}/{total}...", end='\r')
+            return results
+
+        results: List[Optional[Dict]] = [None] * total
+        close = self.backtester._close
+        shm = shared_memory.SharedMemory(create=True, size=max(close.nbytes, 1))
+        try:
+            np.ndarray(close.shape, dtype=np.float64, buffer=shm.buf)[:] = close
+            with ProcessPoolExecutor(
+                max_workers=min(self.max_workers, total),
+                initializer=_init_worker,
+                initargs=(self.symbol, shm.name, len(close), self.timeframe, self.limit)
+            ) as executor:
+                futures = {
+                    executor.submit(_run_one, method, params): i
+                    for i, params in enumerate(grid)
+                }
+                for count, future in enumerate(as_completed(futures), 1):
+                    results[futures[future]] = future.result()
+                    if count % progress_every == 0:
+                        print(f"Progress: {count}/{total}...", end='\r')
+        finally:
+            shm.close()
+            shm.unlink()
+
+        return results
+
     def optimize_momentum(self) -> Dict[str, Any]:
         """
         Optimize Momentum Strategy parameters.
@@ -45,41 +125,26 @@ class StrategyOptimizer:
         ma_fasts = [8, 10, 12, 20]
         ma_slows = [21, 30, 50, 100, 200]
 
-        best_sharpe = -float('inf')
-        best_params = {}
-        best_metrics = {}
-
-        total_combinations = len(rsi_periods) * len(ma_fasts) * len(ma_slows)
-        count = 0
-
-        for rsi, fast, slow in itertools.product(rsi_periods, ma_fasts, ma_slows):
-            if fast >= slow:
-                continue
-
-            metrics = self.backtester.run_momentum(
-                rsi_period=rsi,
-                ma_fast=fast,
-                ma_slow=slow
-            )
-
-            # Optimization Goal: Maximize Sharpe Ratio
-            # Penalty for very low trade count (< 10) to avoid overfitting small samples
-            sharpe = metrics['sharpe_ratio']
-            if metrics['trades'] < 10:
-                sharpe = -10
-
-            if sharpe > best_sharpe:
-                best_sharpe = sharpe
-                best_params = {
-                    'rsi_period': rsi,
-                    'ma_fast': fast,
-                    'ma_slow': slow
-                }
-                best_metrics = metrics
-
-            count += 1
-            if count % 10 == 0:
-                print(f"Progress: {count}/{total_combinations}...", end='\r')
+        # Momentum is path-independent: score the whole grid in one tensor pass
+        scores = self.backtester.run_momentum_grid(rsi_periods, ma_fasts, ma_slows)
+
+        # Optimization Goal: Maximize Sharpe Ratio
+        # Penalty for very low trade count (< 10) to avoid overfitting small samples
+        sharpe = np.where(scores['trades'] < 10, -10.0, scores['sharpe_ratio'])
+        sharpe = np.where(scores['valid'], sharpe, -np.inf)
+
+        # argmax picks the first best combo in grid order
+        r, f, s = np.unravel_index(np.argmax(sharpe), sharpe.shape)
+        best_sharpe = sharpe[r, f, s]
+        best_params = {
+            'rsi_period': rsi_periods[r],
+            'ma_fast': ma_fasts[f],
+            'ma_slow': ma_slows[s]
+        }
+        best_metrics = {
+            key: scores[key][r, f, s]
+            for key in ('total_return', 'annualized_return', 'sharpe_ratio', 'max_drawdown', 'trades')
+        }
 
         logger.info(f"\n[DONE] Best Momentum Params: {best_params}")
         logger.info(f"Sharpe: {best_sharpe:.2f} | Return: {best_metrics['total_return']:.2%} | DD: {best_metrics['max_drawdown']:.2%}")
@@ -108,16 +173,13 @@ class StrategyOptimizer:
         best_params = {}
         best_metrics = {}
 
-        total_combinations = len(rsi_periods) * len(bb_periods) * len(bb_stds)
-        count = 0
-
-        for rsi, bb_p, bb_s in itertools.product(rsi_periods, bb_periods, bb_stds):
-            metrics = self.backtester.run_mean_reversion(
-                rsi_period=rsi,
-                bb_period=bb_p,
-                bb_std=bb_s
-            )
+        grid = [
+            {'rsi_period': rsi, 'bb_period': bb_p, 'bb_std': bb_s}
+            for rsi, bb_p, bb_s in itertools.product(rsi_periods, bb_periods, bb_stds)
+        ]
+        results = self._evaluate_grid('run_mean_reversion', grid, progress_every=5)
 
+        for params, metrics in zip(grid, results):
             # Optimization Goal: Maximize Sharpe Ratio
             sharpe = metrics['sharpe_ratio']
             if metrics['trades'] < 5:
@@ -125,17 +187,9 @@ class StrategyOptimizer:
 
             if sharpe > best_sharpe:
                 best_sharpe = sharpe
-                best_params = {
-                    'rsi_period': rsi,
-                    'bb_period': bb_p,
-                    'bb_std': bb_s
-                }
+                best_params = params
                 best_metrics = metrics
 
-            count += 1
-            if count % 5 == 0:
-                print(f"Progress: {count}/{total_combinations}...", end='\r')
-
         logger.info(f"\n[DONE] Best Mean Reversion Params: {best_params}")
         logger.info(f"Sharpe: {best_sharpe:.2f} | Return: {best_metrics['total_return']:.2%} | DD: {best_metrics['max_drawdown']:.2%}")
 
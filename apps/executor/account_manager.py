@@ -2,13 +2,75 @@
 Account Manager - Track positions, P&L, and trading metrics
 """
 import logging
-from typing import Dict, List, Optional
+import sys
+import time
+from typing import Dict, List, Mapping, Optional, Tuple, Union
+import numpy as np
+import pandas as pd
 from dataclasses import dataclass, field
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 from enum import Enum
 
+from dateutil.tz import tzlocal
+
+from apps.executor.pnl_kernels import close_pnl, update_pnl_batch
+
 logger = logging.getLogger(__name__)
 
+# Initial row capacity of the open-position arrays (doubled when full)
+_INITIAL_CAPACITY = 16
+# Initial row capacity of the closed-trade columns (doubled when full)
+_TRADE_CAPACITY = 4096
+
+
+# print_stats() layout, rendered with one format_map() call and written in one go
+_STATS_TEMPLATE = "\n".join([
+    "",
+    "=" * 60,
+    "ACCOUNT STATISTICS",
+    "=" * 60,
+    "Balance:        ${balance:>12,.2f}",
+    "Equity:         ${equity:>12,.2f}",
+    "Unrealized P&L: ${unrealized_pnl:>12,.2f}",
+    "Total Return:   {total_return_pct:>12.2f}%",
+    "-" * 60,
+    "Today's P&L:    ${daily_pnl:>12,.2f}",
+    "Today's Trades: {daily_trades:>13}",
+    "-" * 60,
+    "Total Trades:   {total_trades:>13}",
+    "Wins / Losses:  {winning_trades:>6} / {losing_trades:<6}",
+    "Win Rate:       {win_rate:>12.2f}%",
+    "Profit Factor:  {profit_factor:>12.2f}",
+    "Avg Win:        ${avg_win:>12,.2f}",
+    "Avg Loss:       ${avg_loss:>12,.2f}",
+    "R:R Ratio:      {reward_risk_ratio:>12.2f}",
+    "-" * 60,
+    "Open Positions: {open_positions:>13}",
+    "=" * 60,
+    ""
+])
+
+
+class _Money:
+    """Log argument that renders an optional price as $x.xx only if the record is emitted."""
+    __slots__ = ('v',)
+    
+    def __init__(self, v: Optional[float]):
+        self.v = v
+    
+    def __str__(self) -> str:
+        return "None" if self.v is None else f"${self.v:.2f}"
+
+
+def _from_ns(ns: int) -> datetime:
+    """Epoch nanoseconds -> naive local datetime."""
+    return datetime.fromtimestamp(ns / 1e9)
+
+
+def _midnight_ns(day: date) -> int:
+    """Epoch nanoseconds of local midnight at the start of `day`."""
+    return int(datetime.combine(day, datetime.min.time()).timestamp()) * 1_000_000_000
+
 
 class PositionSide(Enum):
     """Position side enum."""
@@ -16,31 +78,37 @@ class PositionSide(Enum):
     SHORT = "short"
 
 
-@dataclass
+@dataclass(slots=True)
 class Position:
     """Represents an open trading position."""
     symbol: str
     side: PositionSide
     entry_price: float
     size: float  # Amount in base currency
-    entry_time: datetime = field(default_factory=datetime.now)
+    entry_time_ns: int = field(default_factory=time.time_ns)  # Epoch nanoseconds
     stop_loss: Optional[float] = None
     take_profit: Optional[float] = None
     unrealized_pnl: float = 0.0
+    side_sign: int = field(default=1, init=False)  # +1 LONG, -1 SHORT
+    _inv_investment_100: float = field(default=0.0, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self.side_sign = 1 if self.side == PositionSide.LONG else -1
+        investment = self.entry_price * self.size
+        self._inv_investment_100 = 100.0 / investment if investment else 0.0
+    
+    @property
+    def entry_time(self) -> datetime:
+        """Entry time as a local datetime."""
+        return _from_ns(self.entry_time_ns)
     
     def update_pnl(self, current_price: float):
         """Update unrealized P&L based on current price."""
-        if self.side == PositionSide.LONG:
-            self.unrealized_pnl = (current_price - self.entry_price) * self.size
-        else:  # SHORT
-            self.unrealized_pnl = (self.entry_price - current_price) * self.size
+        self.unrealized_pnl = self.side_sign * (current_price - self.entry_price) * self.size
     
     def get_roi(self) -> float:
         """Get return on investment percentage."""
-        investment = self.entry_price * self.size
-        if investment == 0:
-            return 0.0
-        return (self.unrealized_pnl / investment) * 100
+        return self.unrealized_pnl * self._inv_investment_100
     
     def to_dict(self) -> Dict:
         """Convert to dictionary."""
@@ -57,7 +125,7 @@ class Position:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class ClosedTrade:
     """Represents a closed trade."""
     symbol: str
@@ -66,14 +134,31 @@ class ClosedTrade:
     exit_price: float
     size: float
     realized_pnl: float
-    entry_time: datetime
-    exit_time: datetime
+    entry_time_ns: int  # Epoch nanoseconds
+    exit_time_ns: int
     duration_seconds: float
     
+    @property
+    def entry_time(self) -> datetime:
+        """Entry time as a local datetime."""
+        return _from_ns(self.entry_time_ns)
+    
+    @property
+    def exit_time(self) -> datetime:
+        """Exit time as a local datetime."""
+        return _from_ns(self.exit_time_ns)
+    
     def was_winner(self) -> bool:
         """Check if trade was profitable."""
         return self.realized_pnl > 0
     
+    def get_roi(self) -> float:
+        """Get realized return on investment percentage."""
+        investment = self.entry_price * self.size
+        if investment == 0:
+            return 0.0
+        return (self.realized_pnl / investment) * 100
+    
     def to_dict(self) -> Dict:
         """Convert to dictionary."""
         return {
@@ -90,6 +175,100 @@ class ClosedTrade:
         }
 
 
+class _PositionView:
+    """
+    Read-only, live view of one open position in an AccountManager.
+    
+    Attributes read straight from the manager's position columns, so the
+    view always reflects the latest mark price without copying a Position.
+    Writes are rejected (prices go through update_pnl(), which delegates to
+    the manager). Once the position is closed, reading it raises LookupError.
+    """
+    __slots__ = ('_manager', '_sym_id', '_entry_ns')
+    
+    # Attribute -> (position column, converter)
+    _COLUMN_FIELDS = {
+        'entry_price': ('_entry', float),
+        'size': ('_size', float),
+        'unrealized_pnl': ('_pnl', float),
+        'side_sign': ('_side_sign', int),
+        'entry_time_ns': ('_entry_ns', int)
+    }
+    
+    def __init__(self, manager: 'AccountManager', sym_id: int):
+        object.__setattr__(self, '_manager', manager)
+        object.__setattr__(self, '_sym_id', sym_id)
+        object.__setattr__(self, '_entry_ns', int(manager._entry_ns[manager._pos_row[sym_id]]))
+    
+    def _row(self) -> int:
+        manager = self._manager
+        row = manager._pos_row.get(self._sym_id, -1)
+        if row < 0 or manager._entry_ns[row] != self._entry_ns:
+            raise LookupError(f"Position for {self.symbol} is no longer open")
+        return row
+    
+    @property
+    def symbol(self) -> str:
+        return self._manager._symbol_table[self._sym_id]
+    
+    @property
+    def side(self) -> PositionSide:
+        return PositionSide.LONG if self._manager._side_sign[self._row()] > 0 else PositionSide.SHORT
+    
+    @property
+    def entry_time(self) -> datetime:
+        return _from_ns(self._entry_ns)
+    
+    @property
+    def stop_loss(self) -> Optional[float]:
+        value = self._manager._stop_loss[self._row()]
+        return None if np.isnan(value) else float(value)
+    
+    @property
+    def take_profit(self) -> Optional[float]:
+        value = self._manager._take_profit[self._row()]
+        return None if np.isnan(value) else float(value)
+    
+    def __getattr__(self, name: str):
+        try:
+            column, convert = _PositionView._COLUMN_FIELDS[name]
+        except KeyError:
+            raise AttributeError(name) from None
+        return convert(getattr(self._manager, column)[self._row()])
+    
+    def __setattr__(self, name: str, value):
+        raise AttributeError("Position views are read-only; update prices through the AccountManager")
+    
+    def __repr__(self) -> str:
+        return f"_PositionView({self.symbol!r})"
+    
+    def update_pnl(self, current_price: float):
+        """Mark this position to market (through the manager)."""
+        self._manager.update_position_pnl(self.symbol, current_price)
+    
+    def get_roi(self) -> float:
+        """Get return on investment percentage."""
+        return float(self._manager._roi[self._row()])
+    
+    def to_dict(self) -> Dict:
+        """Convert to dictionary (read directly from the position columns)."""
+        manager = self._manager
+        row = self._row()
+        stop_loss = manager._stop_loss[row]
+        take_profit = manager._take_profit[row]
+        return {
+            'symbol': self.symbol,
+            'side': (PositionSide.LONG if manager._side_sign[row] > 0 else PositionSide.SHORT).value,
+            'entry_price': float(manager._entry[row]),
+            'size': float(manager._size[row]),
+            'entry_time': self.entry_time.isoformat(),
+            'stop_loss': None if np.isnan(stop_loss) else float(stop_loss),
+            'take_profit': None if np.isnan(take_profit) else float(take_profit),
+            'unrealized_pnl': float(manager._pnl[row]),
+            'roi_pct': float(manager._roi[row])
+        }
+
+
 class AccountManager:
     """
     Manages trading account state, positions, and metrics.
@@ -101,6 +280,16 @@ class AccountManager:
     - Trading statistics (win rate, profit factor, etc.)
     """
     
+    # Columns swapped/grown together when rows are added or removed
+    _COLUMNS = (
+        '_row_sym', '_side_sign', '_entry', '_size', '_size_signed', '_price',
+        '_pnl', '_roi', '_stop_loss', '_take_profit', '_entry_ns'
+    )
+    _TRADE_COLUMNS = (
+        '_ct_entry', '_ct_exit', '_ct_size', '_ct_pnl', '_ct_side',
+        '_ct_entry_ns', '_ct_exit_ns', '_ct_symbol_ids'
+    )
+    
     def __init__(self, initial_balance: float = 10000.0):
         """
         Initialize account manager.
@@ -110,37 +299,176 @@ class AccountManager:
         """
         self.initial_balance = initial_balance
         self.current_balance = initial_balance
+        self._inv_initial_balance_100 = 100.0 / initial_balance if initial_balance else 0.0
+        
+        # Symbols are interned to small ids the first time they are traded, so
+        # hot-path lookups go id -> row instead of keeping strings per row.
+        self._symbol_table: List[str] = []
+        self._sym_id: Dict[str, int] = {}
+        
+        # Open positions as struct-of-arrays: row i of every column is one position.
+        # Mark-to-market then runs over contiguous float64 arrays instead of
+        # Position objects; Position instances are built on demand for callers.
+        self._n = 0  # Rows in use
+        self._pos_row: Dict[int, int] = {}  # Symbol id -> row
+        self._row_sym = np.zeros(_INITIAL_CAPACITY, dtype=np.int32)  # Row -> symbol id
+        self._side_sign = np.zeros(_INITIAL_CAPACITY, dtype=np.int8)  # +1 LONG, -1 SHORT
+        self._entry = np.zeros(_INITIAL_CAPACITY)
+        self._size = np.zeros(_INITIAL_CAPACITY)
+        self._size_signed = np.zeros(_INITIAL_CAPACITY)  # +size LONG, -size SHORT
+        self._price = np.zeros(_INITIAL_CAPACITY)  # Last mark price
+        self._pnl = np.zeros(_INITIAL_CAPACITY)  # Unrealized P&L at the mark price
+        self._roi = np.zeros(_INITIAL_CAPACITY)  # Unrealized ROI %
+        self._stop_loss = np.full(_INITIAL_CAPACITY, np.nan)  # NaN = not set
+        self._take_profit = np.full(_INITIAL_CAPACITY, np.nan)
+        self._entry_ns = np.zeros(_INITIAL_CAPACITY, dtype=np.int64)  # Epoch nanoseconds
         
-        # Position tracking
-        self.open_positions: Dict[str, Position] = {}
-        self.closed_trades: List[ClosedTrade] = []
+        # Running sum of self._pnl, patched by the P&L delta of every update
+        self._unrealized_total = 0.0
         
-        # Daily tracking
+        # Closed trade history as typed columns (row i = i-th closed trade).
+        self._ct_len = 0
+        self._ct_entry = np.zeros(_TRADE_CAPACITY)
+        self._ct_exit = np.zeros(_TRADE_CAPACITY)
+        self._ct_size = np.zeros(_TRADE_CAPACITY)
+        self._ct_pnl = np.zeros(_TRADE_CAPACITY)
+        self._ct_side = np.zeros(_TRADE_CAPACITY, dtype=np.int8)
+        self._ct_entry_ns = np.zeros(_TRADE_CAPACITY, dtype=np.int64)
+        self._ct_exit_ns = np.zeros(_TRADE_CAPACITY, dtype=np.int64)
+        self._ct_symbol_ids = np.zeros(_TRADE_CAPACITY, dtype=np.int32)
+        
+        # Daily tracking. The day's bounds are cached in epoch nanoseconds so
+        # the per-call rollover check is one clock read and an int compare.
         self.today = date.today()
+        self._today_start_ns = _midnight_ns(self.today)
+        self._today_end_ns = _midnight_ns(self.today + timedelta(days=1))
+        self._day_start_balance = initial_balance
         self.daily_pnl = 0.0
         self.daily_trades = 0
         
-        # All-time metrics
-        self.total_trades = 0
-        self.winning_trades = 0
-        self.losing_trades = 0
-        self.total_profit = 0.0
-        self.total_loss = 0.0
-        
-        logger.info(f"Account Manager initialized with ${initial_balance:.2f}")
+        logger.info("Account Manager initialized with $%.2f", initial_balance)
     
     def reset_daily_metrics(self):
         """Reset daily metrics (call at start of new trading day)."""
-        today = date.today()
-        if today != self.today:
+        if time.time_ns() >= self._today_end_ns:
             logger.info(
-                f"New trading day. Previous day P&L: ${self.daily_pnl:.2f} "
-                f"({self.daily_trades} trades)"
+                "New trading day. Previous day P&L: $%.2f (%d trades)",
+                self.daily_pnl, self.daily_trades
             )
-            self.today = today
+            self.today = date.today()
+            self._today_start_ns = _midnight_ns(self.today)
+            self._today_end_ns = _midnight_ns(self.today + timedelta(days=1))
+            self._day_start_balance = self.current_balance
             self.daily_pnl = 0.0
             self.daily_trades = 0
     
+    def _ensure_capacity(self):
+        """Double the column arrays when every row is in use."""
+        capacity = len(self._entry)
+        if self._n < capacity:
+            return
+        for name in self._COLUMNS:
+            old = getattr(self, name)
+            new = np.resize(old, 2 * capacity)
+            new[capacity:] = np.nan if name in ('_stop_loss', '_take_profit') else 0.0
+            setattr(self, name, new)
+    
+    def _remove_row(self, row: int):
+        """Remove a row by moving the last row into its slot."""
+        del self._pos_row[int(self._row_sym[row])]
+        last = self._n - 1
+        if row != last:
+            for name in self._COLUMNS:
+                column = getattr(self, name)
+                column[row] = column[last]
+            self._pos_row[int(self._row_sym[row])] = row
+        self._n = last
+    
+    def _position_at(self, row: int) -> Position:
+        """Build a Position snapshot from a row of the open-position arrays."""
+        stop_loss = self._stop_loss[row]
+        take_profit = self._take_profit[row]
+        return Position(
+            symbol=self._symbol_table[self._row_sym[row]],
+            side=PositionSide.LONG if self._side_sign[row] > 0 else PositionSide.SHORT,
+            entry_price=float(self._entry[row]),
+            size=float(self._size[row]),
+            entry_time_ns=int(self._entry_ns[row]),
+            stop_loss=None if np.isnan(stop_loss) else float(stop_loss),
+            take_profit=None if np.isnan(take_profit) else float(take_profit),
+            unrealized_pnl=float(self._pnl[row])
+        )
+    
+    def _intern(self, symbol: str) -> int:
+        """Small integer id for a symbol (assigned on first use)."""
+        sym_id = self._sym_id.get(symbol)
+        if sym_id is None:
+            sym_id = self._sym_id[symbol] = len(self._symbol_table)
+            self._symbol_table.append(symbol)
+        return sym_id
+    
+    def _row_of(self, symbol: str) -> int:
+        """Open-position row of a symbol, or -1 if it has no open position."""
+        return self._pos_row.get(self._sym_id.get(symbol, -1), -1)
+    
+    def _append_trade(
+        self,
+        sym_id: int,
+        side_sign: int,
+        entry_price: float,
+        exit_price: float,
+        size: float,
+        realized_pnl: float,
+        entry_ns: int,
+        exit_ns: int
+    ) -> int:
+        """Write a closed trade into the next free row (doubling capacity when full)."""
+        row = self._ct_len
+        if row == len(self._ct_pnl):
+            for name in self._TRADE_COLUMNS:
+                old = getattr(self, name)
+                new = np.zeros(2 * row, dtype=old.dtype)
+                new[:row] = old
+                setattr(self, name, new)
+        
+        self._ct_symbol_ids[row] = sym_id
+        self._ct_side[row] = side_sign
+        self._ct_entry[row] = entry_price
+        self._ct_exit[row] = exit_price
+        self._ct_size[row] = size
+        self._ct_pnl[row] = realized_pnl
+        self._ct_entry_ns[row] = entry_ns
+        self._ct_exit_ns[row] = exit_ns
+        self._ct_len = row + 1
+        return row
+    
+    def _trade_at(self, row: int) -> ClosedTrade:
+        """Build a ClosedTrade record from a row of the closed-trade columns."""
+        entry_ns = int(self._ct_entry_ns[row])
+        exit_ns = int(self._ct_exit_ns[row])
+        return ClosedTrade(
+            symbol=self._symbol_table[self._ct_symbol_ids[row]],
+            side=PositionSide.LONG if self._ct_side[row] > 0 else PositionSide.SHORT,
+            entry_price=float(self._ct_entry[row]),
+            exit_price=float(self._ct_exit[row]),
+            size=float(self._ct_size[row]),
+            realized_pnl=float(self._ct_pnl[row]),
+            entry_time_ns=entry_ns,
+            exit_time_ns=exit_ns,
+            duration_seconds=(exit_ns - entry_ns) / 1e9
+        )
+    
+    @property
+    def closed_trades(self) -> List[ClosedTrade]:
+        """Closed trades in close order (records built on demand from the trade columns)."""
+        return [self._trade_at(row) for row in range(self._ct_len)]
+    
+    @property
+    def open_positions(self) -> Dict[str, _PositionView]:
+        """Open positions keyed by symbol (read-only live views)."""
+        table = self._symbol_table
+        return {table[sym_id]: _PositionView(self, sym_id) for sym_id in self._row_sym[:self._n].tolist()}
+    
     def open_position(
         self,
         symbol: str,
@@ -164,28 +492,34 @@ class AccountManager:
         Returns:
             Created Position object
         """
-        if symbol in self.open_positions:
-            logger.warning(f"Position already exists for {symbol}. Closing old position first.")
+        if self._row_of(symbol) >= 0:
+            logger.warning("Position already exists for %s. Closing old position first.", symbol)
             self.close_position(symbol, entry_price)  # Close at same price
         
         position_side = PositionSide.LONG if side.lower() == 'long' else PositionSide.SHORT
         
-        position = Position(
-            symbol=symbol,
-            side=position_side,
-            entry_price=entry_price,
-            size=size,
-            stop_loss=stop_loss,
-            take_profit=take_profit
-        )
+        self._ensure_capacity()
+        row = self._n
+        sym_id = self._intern(symbol)
+        self._pos_row[sym_id] = row
+        self._row_sym[row] = sym_id
+        self._n = row + 1
+        self._entry[row] = entry_price
+        self._size[row] = size
+        self._side_sign[row] = 1 if position_side == PositionSide.LONG else -1
+        self._size_signed[row] = self._side_sign[row] * size
+        self._price[row] = entry_price
+        self._entry_ns[row] = time.time_ns()
+        self._pnl[row] = 0.0
+        self._roi[row] = 0.0
+        self._stop_loss[row] = np.nan if stop_loss is None else stop_loss
+        self._take_profit[row] = np.nan if take_profit is None else take_profit
         
-        self.open_positions[symbol] = position
+        position = self._position_at(row)
         
-        sl_str = f"${stop_loss:.2f}" if stop_loss else "None"
-        tp_str = f"${take_profit:.2f}" if take_profit else "None"
         logger.info(
-            f"[OK] Opened {side.upper()} position: {size} {symbol} @ ${entry_price:.2f} "
-            f"(SL: {sl_str}, TP: {tp_str})"
+            "[OK] Opened %s position: %s %s @ $%.2f (SL: %s, TP: %s)",
+            side.upper(), size, symbol, entry_price, _Money(stop_loss), _Money(take_profit)
         )
         
         return position
@@ -205,115 +539,251 @@ class AccountManager:
         Returns:
             ClosedTrade object or None if position doesn't exist
         """
-        position = self.open_positions.get(symbol)
+        row = self._row_of(symbol)
         
-        if not position:
-            logger.warning(f"No open position found for {symbol}")
+        if row < 0:
+            logger.warning("No open position found for %s", symbol)
             return None
         
         # Calculate realized P&L
-        if position.side == PositionSide.LONG:
-            realized_pnl = (exit_price - position.entry_price) * position.size
-        else:  # SHORT
-            realized_pnl = (position.entry_price - exit_price) * position.size
-        
-        # Calculate duration
-        exit_time = datetime.now()
-        duration = (exit_time - position.entry_time).total_seconds()
+        realized_pnl = float(close_pnl(
+            self._side_sign[row], self._entry[row], self._size[row], exit_price
+        ))
         
-        # Create closed trade record
-        closed_trade = ClosedTrade(
-            symbol=symbol,
-            side=position.side,
-            entry_price=position.entry_price,
-            exit_price=exit_price,
-            size=position.size,
-            realized_pnl=realized_pnl,
-            entry_time=position.entry_time,
-            exit_time=exit_time,
-            duration_seconds=duration
+        # Record the trade
+        trade_row = self._append_trade(
+            self._row_sym[row],
+            self._side_sign[row],
+            self._entry[row],
+            exit_price,
+            self._size[row],
+            realized_pnl,
+            self._entry_ns[row],
+            time.time_ns()
         )
+        closed_trade = self._trade_at(trade_row)
         
         # Update metrics
-        self.closed_trades.append(closed_trade)
         self.current_balance += realized_pnl
         self.daily_pnl += realized_pnl
         self.daily_trades += 1
-        self.total_trades += 1
-        
-        if realized_pnl > 0:
-            self.winning_trades += 1
-            self.total_profit += realized_pnl
-        else:
-            self.losing_trades += 1
-            self.total_loss += abs(realized_pnl)
         
         # Remove from open positions
-        del self.open_positions[symbol]
+        self._unrealized_total -= self._pnl[row]
+        self._remove_row(row)
+        if not self._n:
+            self._unrealized_total = 0.0  # Drop accumulated rounding drift
         
-        logger.info(
-            f"[OK] Closed {position.side.value.upper()} position: {symbol} @ ${exit_price:.2f} | "
-            f"P&L: ${realized_pnl:+.2f} ({closed_trade.get_roi():+.2f}%)"
-        )
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "[OK] Closed %s position: %s @ $%.2f | P&L: $%+.2f (%+.2f%%)",
+                closed_trade.side.value.upper(), symbol, exit_price, realized_pnl, closed_trade.get_roi()
+            )
         
         return closed_trade
     
     def update_position_pnl(self, symbol: str, current_price: float):
-        """Update unrealized P&L for a position."""
-        position = self.open_positions.get(symbol)
-        if position:
-            position.update_pnl(current_price)
+        """Update unrealized P&L for a position (use update_all_pnl() to mark many symbols at once)."""
+        row = self._row_of(symbol)
+        if row >= 0:
+            self._price[row] = current_price
+            pnl = close_pnl(
+                self._side_sign[row], self._entry[row], self._size[row], current_price
+            )
+            self._unrealized_total += pnl - self._pnl[row]
+            self._pnl[row] = pnl
+            investment = self._entry[row] * self._size[row]
+            self._roi[row] = 0.0 if investment == 0 else self._pnl[row] / investment * 100.0
+    
+    def update_all_pnl(self, prices: Mapping[str, float]) -> None:
+        """
+        Mark every open position to market in one batch.
+        
+        Prefer this over calling update_position_pnl() per symbol on each
+        tick. Positions whose symbol is missing from `prices` keep their
+        last mark price.
+        
+        Args:
+            prices: Current price per symbol
+        """
+        n = self._n
+        if not n:
+            return
+        table = self._symbol_table
+        current = self._price
+        new_prices = np.fromiter(
+            (prices.get(table[sym_id], current[row]) for row, sym_id in enumerate(self._row_sym[:n].tolist())),
+            dtype=np.float64,
+            count=n
+        )
+        self._revalue(new_prices)
+    
+    def update_all(self, prices: np.ndarray):
+        """
+        Mark all open positions to market from an array of prices.
+        
+        Args:
+            prices: Current prices in open-position row order (see position_symbols())
+        """
+        self._revalue(np.asarray(prices, dtype=np.float64))
     
-    def get_position(self, symbol: str) -> Optional[Position]:
-        """Get open position for symbol."""
-        return self.open_positions.get(symbol)
+    def position_symbols(self) -> List[str]:
+        """Symbols of the open positions in row order (the order update_all() expects)."""
+        return [self._symbol_table[sym_id] for sym_id in self._row_sym[:self._n]]
+    
+    def _revalue(self, new_prices: np.ndarray):
+        """Set every row's mark price and recompute P&L/ROI with the batch kernel."""
+        n = self._n
+        # P&L is linear in price, so the change in the total is one dot product
+        self._unrealized_total += float(np.vdot(self._size_signed[:n], new_prices - self._price[:n]))
+        self._price[:n] = new_prices
+        update_pnl_batch(
+            self._side_sign[:n], self._entry[:n], self._size[:n], self._price[:n],
+            self._pnl[:n], self._roi[:n]
+        )
+    
+    def get_position(self, symbol: str) -> Optional[_PositionView]:
+        """Get a read-only live view of the open position for symbol."""
+        row = self._row_of(symbol)
+        return None if row < 0 else _PositionView(self, int(self._row_sym[row]))
     
     def get_daily_pnl(self) -> float:
         """Get today's realized P&L."""
         self.reset_daily_metrics()
         return self.daily_pnl
     
+    def get_intraday_equity_curve(self) -> np.ndarray:
+        """
+        Realized balance after each of today's closed trades.
+        
+        Element 0 is the balance at the start of the day; today's trades are
+        the tail of the realized P&L column, so this is one cumulative sum.
+        """
+        self.reset_daily_metrics()
+        pnl = self._ct_pnl[self._window_start('today'):self._ct_len]
+        curve = np.empty(len(pnl) + 1)
+        curve[0] = self._day_start_balance
+        np.cumsum(pnl, out=curve[1:])
+        curve[1:] += self._day_start_balance
+        return curve
+    
+    def get_intraday_max_drawdown(self) -> float:
+        """Largest peak-to-trough drop of today's realized equity curve (<= 0, in USDT)."""
+        curve = self.get_intraday_equity_curve()
+        return float(np.min(curve - np.maximum.accumulate(curve)))
+    
     def get_total_unrealized_pnl(self) -> float:
         """Get total unrealized P&L from all open positions."""
-        return sum(pos.unrealized_pnl for pos in self.open_positions.values())
+        return float(self._unrealized_total)
     
     def get_equity(self) -> float:
         """Get total account equity (balance + unrealized P&L)."""
         return self.current_balance + self.get_total_unrealized_pnl()
     
+    def _window_start(self, window: Union[str, int]) -> int:
+        """
+        First closed-trade row of a stats window.
+        
+        'all' is every trade, an int N the last N trades, and 'today' the
+        trades closed since local midnight (exit times are appended in order,
+        so this is a binary search).
+        """
+        n = self._ct_len
+        if window == 'all':
+            return 0
+        if window == 'today':
+            return int(np.searchsorted(self._ct_exit_ns[:n], self._today_start_ns, side='left'))
+        if isinstance(window, int) and window >= 0:
+            return max(n - window, 0)
+        raise ValueError(f"Unknown stats window: {window!r}")
+    
+    def _agg(self, start: int = 0) -> Tuple[int, int, float, float]:
+        """(trades, wins, total profit, total loss) over closed trades from row `start`."""
+        pnl = self._ct_pnl[start:self._ct_len]
+        # Clamping instead of boolean indexing: no branch and no gathered copies
+        return (
+            len(pnl),
+            int(np.count_nonzero(pnl > 0)),
+            float(np.maximum(pnl, 0.0).sum()),
+            float(-np.minimum(pnl, 0.0).sum())
+        )
+    
+    @staticmethod
+    def _trade_stats(trades: int, wins: int, total_profit: float, total_loss: float) -> Dict:
+        """Win/loss ratios from aggregated trade results."""
+        losses = trades - wins
+        avg_win = total_profit / wins if wins else 0.0
+        avg_loss = total_loss / losses if losses else 0.0
+        if total_loss == 0:
+            profit_factor = float('inf') if total_profit > 0 else 0.0
+        else:
+            profit_factor = total_profit / total_loss
+        
+        return {
+            'total_trades': trades,
+            'winning_trades': wins,
+            'losing_trades': losses,
+            'win_rate': (wins / trades) * 100 if trades else 0.0,
+            'profit_factor': profit_factor,
+            'avg_win': avg_win,
+            'avg_loss': avg_loss,
+            'reward_risk_ratio': avg_win / avg_loss if avg_loss else 0.0
+        }
+    
+    @property
+    def total_trades(self) -> int:
+        """All-time closed trade count."""
+        return self._ct_len
+    
+    @property
+    def winning_trades(self) -> int:
+        """All-time profitable trades."""
+        return self._agg()[1]
+    
+    @property
+    def losing_trades(self) -> int:
+        """All-time break-even or losing trades."""
+        trades, wins, _, _ = self._agg()
+        return trades - wins
+    
+    @property
+    def total_profit(self) -> float:
+        """All-time gross profit."""
+        return self._agg()[2]
+    
+    @property
+    def total_loss(self) -> float:
+        """All-time gross loss (positive number)."""
+        return self._agg()[3]
+    
     def get_win_rate(self) -> float:
         """Get win rate percentage."""
-        if self.total_trades == 0:
-            return 0.0
-        return (self.winning_trades / self.total_trades) * 100
+        return self._trade_stats(*self._agg())['win_rate']
     
     def get_profit_factor(self) -> float:
         """Get profit factor (total profit / total loss)."""
-        if self.total_loss == 0:
-            return float('inf') if self.total_profit > 0 else 0.0
-        return self.total_profit / self.total_loss
+        return self._trade_stats(*self._agg())['profit_factor']
     
     def get_average_win(self) -> float:
         """Get average winning trade size."""
-        if self.winning_trades == 0:
-            return 0.0
-        return self.total_profit / self.winning_trades
+        return self._trade_stats(*self._agg())['avg_win']
     
     def get_average_loss(self) -> float:
         """Get average losing trade size."""
-        if self.losing_trades == 0:
-            return 0.0
-        return self.total_loss / self.losing_trades
+        return self._trade_stats(*self._agg())['avg_loss']
     
     def get_reward_risk_ratio(self) -> float:
         """Get average win / average loss ratio."""
-        avg_loss = self.get_average_loss()
-        if avg_loss == 0:
-            return 0.0
-        return self.get_average_win() / avg_loss
+        return self._trade_stats(*self._agg())['reward_risk_ratio']
     
-    def get_stats(self) -> Dict:
-        """Get comprehensive account statistics."""
+    def get_stats(self, window: Union[str, int] = 'all') -> Dict:
+        """
+        Get comprehensive account statistics.
+        
+        Args:
+            window: Closed trades the win/loss figures cover: 'all', 'today'
+                or the last N trades
+        """
         self.reset_daily_metrics()
         
         return {
@@ -322,40 +792,50 @@ class AccountManager:
             'unrealized_pnl': self.get_total_unrealized_pnl(),
             'daily_pnl': self.daily_pnl,
             'daily_trades': self.daily_trades,
-            'total_trades': self.total_trades,
-            'winning_trades': self.winning_trades,
-            'losing_trades': self.losing_trades,
-            'win_rate': self.get_win_rate(),
-            'profit_factor': self.get_profit_factor(),
-            'avg_win': self.get_average_win(),
-            'avg_loss': self.get_average_loss(),
-            'reward_risk_ratio': self.get_reward_risk_ratio(),
-            'open_positions': len(self.open_positions),
-            'total_return_pct': ((self.current_balance - self.initial_balance) / self.initial_balance) * 100
+            'intraday_max_drawdown': self.get_intraday_max_drawdown(),
+            **self._trade_stats(*self._agg(self._window_start(window))),
+            'open_positions': self._n,
+            'total_return_pct': (self.current_balance - self.initial_balance) * self._inv_initial_balance_100
         }
     
+    def closed_trades_frame(self) -> pd.DataFrame:
+        """
+        Closed trades as one DataFrame (same columns as ClosedTrade.to_dict()).
+        
+        Prefer this over calling to_dict() per trade when dumping history:
+        timestamps and sides are formatted column-wise in a single pass.
+        """
+        n = self._ct_len
+        entry_ns = self._ct_entry_ns[:n]
+        exit_ns = self._ct_exit_ns[:n]
+        columns = {
+            'symbol': np.array(self._symbol_table, dtype=object)[self._ct_symbol_ids[:n]],
+            'side_sign': self._ct_side[:n],
+            'entry_price': self._ct_entry[:n],
+            'exit_price': self._ct_exit[:n],
+            'size': self._ct_size[:n],
+            'realized_pnl': self._ct_pnl[:n],
+            'entry_time': self._local_times(entry_ns),
+            'exit_time': self._local_times(exit_ns),
+            'duration_seconds': (exit_ns - entry_ns) / 1e9
+        }
+        return self._format_trades_frame(pd.DataFrame(columns))
+    
+    @staticmethod
+    def _local_times(ns: np.ndarray) -> pd.Series:
+        """Epoch nanoseconds -> naive local timestamps (matching datetime.now())."""
+        return pd.Series(pd.to_datetime(ns, utc=True).tz_convert(tzlocal()).tz_localize(None))
+    
+    @staticmethod
+    def _format_trades_frame(df: pd.DataFrame) -> pd.DataFrame:
+        """Vectorized side/timestamp formatting shared by the frame builders."""
+        df.insert(1, 'side', np.where(df.pop('side_sign') > 0, PositionSide.LONG.value, PositionSide.SHORT.value))
+        df['entry_time'] = df['entry_time'].dt.strftime('%Y-%m-%dT%H:%M:%S.%f')
+        df['exit_time'] = df['exit_time'].dt.strftime('%Y-%m-%dT%H:%M:%S.%f')
+        df['was_winner'] = df['realized_pnl'].to_numpy() > 0
+        return df
+    
     def print_stats(self):
         """Print formatted account statistics."""
-        stats = self.get_stats()
-        
-        print("\n" + "="*60)
-        print("ACCOUNT STATISTICS")
-        print("="*60)
-        print(f"Balance:        ${stats['balance']:>12,.2f}")
-        print(f"Equity:         ${stats['equity']:>12,.2f}")
-        print(f"Unrealized P&L: ${stats['unrealized_pnl']:>12,.2f}")
-        print(f"Total Return:   {stats['total_return_pct']:>12.2f}%")
-        print("-"*60)
-        print(f"Today's P&L:    ${stats['daily_pnl']:>12,.2f}")
-        print(f"Today's Trades: {stats['daily_trades']:>13}")
-        print("-"*60)
-        print(f"Total Trades:   {stats['total_trades']:>13}")
-        print(f"Wins / Losses:  {stats['winning_trades']:>6} / {stats['losing_trades']:<6}")
-        print(f"Win Rate:       {stats['win_rate']:>12.2f}%")
-        print(f"Profit Factor:  {stats['profit_factor']:>12.2f}")
-        print(f"Avg Win:        ${stats['avg_win']:>12,.2f}")
-        print(f"Avg Loss:       ${stats['avg_loss']:>12,.2f}")
-        print(f"R:R Ratio:      {stats['reward_risk_ratio']:>12.2f}")
-        print("-"*60)
-        print(f"Open Positions: {stats['open_positions']:>13}")
-        print("="*60)
+        sys.stdout.write(_STATS_TEMPLATE.format_map(self.get_stats()))
+        sys.stdout.flush()
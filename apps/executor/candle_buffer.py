@@ -0,0 +1,140 @@
+"""
+Candle Buffer - Fixed-size OHLCV history per symbol as NumPy arrays
+Built from feed ticks in place; pandas only at the edges (to_frame).
+"""
+from dataclasses import dataclass, field
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+
+from apps.analytics.indicators import njit
+
+_COLUMNS = ('timestamp', 'open', 'high', 'low', 'close', 'volume')
+
+
+@njit(cache=True)
+def _fold_price(ohlcv, i, price):
+    """Per-tick update of bar i: raise high, lower low, set close."""
+    if price > ohlcv[1, i]:
+        ohlcv[1, i] = price
+    if price < ohlcv[2, i]:
+        ohlcv[2, i] = price
+    ohlcv[3, i] = price
+
+
+@dataclass(slots=True)
+class CandleBuffer:
+    """
+    Last `size` OHLCV bars of one symbol, stored as one array per column.
+
+    Each column is allocated at twice `size` and bars are written forward;
+    when the end is reached the newest `size - 1` bars are copied back to
+    the front. That keeps every column contiguous, so the properties
+    (open, high, low, close, volume, timestamp) are zero-copy views, while
+    appends stay amortized O(1).
+
+    Views are only valid until the next append or seed.
+    """
+    size: int
+    _ts: np.ndarray = field(init=False, repr=False)
+    _ohlcv: np.ndarray = field(init=False, repr=False)
+    _start: int = field(default=0, init=False)
+    _end: int = field(default=0, init=False)
+
+    def __post_init__(self):
+        self._ts = np.zeros(2 * self.size, dtype=np.int64)
+        # Rows are open, high, low, close, volume: each column is a contiguous row
+        self._ohlcv = np.zeros((5, 2 * self.size), dtype=np.float64)
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        """Column view by name, so code written against DataFrame columns (candles['close']) works as is."""
+        if column not in _COLUMNS:
+            raise KeyError(column)
+        return getattr(self, column)
+
+    @property
+    def timestamp(self) -> np.ndarray:
+        """Bar open times in epoch milliseconds."""
+        return self._ts[self._start:self._end]
+
+    @property
+    def open(self) -> np.ndarray:
+        return self._ohlcv[0, self._start:self._end]
+
+    @property
+    def high(self) -> np.ndarray:
+        return self._ohlcv[1, self._start:self._end]
+
+    @property
+    def low(self) -> np.ndarray:
+        return self._ohlcv[2, self._start:self._end]
+
+    @property
+    def close(self) -> np.ndarray:
+        return self._ohlcv[3, self._start:self._end]
+
+    @property
+    def volume(self) -> np.ndarray:
+        return self._ohlcv[4, self._start:self._end]
+
+    @property
+    def last_time(self) -> int:
+        """Open time (ms) of the newest bar, or -1 when empty."""
+        return int(self._ts[self._end - 1]) if self._end > self._start else -1
+
+    def seed(self, ohlcv: Sequence[Sequence[float]]):
+        """Replace the contents with REST klines ([ts, open, high, low, close, volume] rows)."""
+        rows = np.asarray(ohlcv[-self.size:], dtype=np.float64).reshape(-1, 6)
+        n = rows.shape[0]
+        self._ts[:n] = rows[:, 0]
+        self._ohlcv[:, :n] = rows[:, 1:].T
+        self._start = 0
+        self._end = n
+
+    def update(self, price: float):
+        """Fold a price into the newest bar (high/low/close)."""
+        _fold_price(self._ohlcv, self._end - 1, float(price))
+
+    def append(self, timestamp_ms: int, price: float, volume: float = 0.0):
+        """Start a new bar at price, dropping the oldest one when full."""
+        if self._end == self._ts.shape[0]:
+            # Out of room: move the newest size - 1 bars back to the front
+            keep = self.size - 1
+            src = self._end - keep
+            self._ts[:keep] = self._ts[src:self._end]
+            self._ohlcv[:, :keep] = self._ohlcv[:, src:self._end]
+            self._start = 0
+            self._end = keep
+
+        i = self._end
+        self._ts[i] = timestamp_ms
+        self._ohlcv[0:4, i] = price
+        self._ohlcv[4, i] = volume
+        self._end = i + 1
+        if self._end - self._start > self.size:
+            self._start += 1
+
+    def to_frame(self) -> pd.DataFrame:
+        """Copy the bars into a DataFrame (timestamp, open, high, low, close, volume)."""
+        return pd.DataFrame({
+            'timestamp': pd.to_datetime(self.timestamp, unit='ms'),
+            'open': self.open.copy(),
+            'high': self.high.copy(),
+            'low': self.low.copy(),
+            'close': self.close.copy(),
+            'volume': self.volume.copy(),
+        })
+
+
+def _warm_up():
+    """Compile (or load from cache) the per-tick kernels at import, not on the first tick."""
+    buffer = CandleBuffer(2)
+    buffer.append(0, 1.0)
+    buffer.update(1.0)
+
+
+_warm_up()
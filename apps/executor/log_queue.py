@@ -0,0 +1,38 @@
+"""
+Log Queue - Move log I/O off the trading path
+Log calls only enqueue the record; a QueueListener thread owns the real handlers.
+"""
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import Tuple
+
+
+def start_log_listener(*handlers: logging.Handler) -> Tuple[QueueHandler, QueueListener]:
+    """
+    Start a listener thread that writes records through `handlers`.
+
+    The returned QueueHandler is what loggers attach. It merges only the
+    message, so each handler's own formatter applies the layout on the
+    listener thread. The listener is stopped, flushing the queue, at exit
+    (or earlier through stop_log_listener).
+
+    Returns:
+        (queue_handler, listener)
+    """
+    log_queue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    return queue_handler, listener
+
+
+def stop_log_listener(listener: QueueListener):
+    """Flush and stop a listener before exit, closing its handlers."""
+    atexit.unregister(listener.stop)
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
@@ -11,7 +11,9 @@ Manages trading across multiple assets simultaneously with:
 This is the CORE of the multi-asset trading system.
 """
 import asyncio
+import functools
 import sys
+import time
 
 # FIX for Windows: ZMQ requires SelectorEventLoop on Windows
 if sys.platform == 'win32':
@@ -22,33 +24,109 @@ import zmq.asyncio
 import msgpack
 import pandas as pd
 import logging
+from logging.handlers import RotatingFileHandler
+from collections import defaultdict
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional, Dict, List
+from typing import Callable, Optional, Dict, List, Tuple
 import os
 
+try:
+    import uvloop
+except ImportError:  # Not available on Windows; the default loop is used instead
+    uvloop = None
+
+try:
+    import msgspec
+    _decode_tick = msgspec.msgpack.Decoder().decode  # C decoder, about 2x faster than msgpack
+except ImportError:
+    _decode_tick = functools.partial(msgpack.unpackb, raw=False)
+
 from core.config import settings
 from apps.executor.testnet_connector import TestnetConnector
 from apps.executor.account_manager import AccountManager
+from apps.executor.candle_buffer import CandleBuffer
 from apps.executor.risk_manager import ProfessionalRiskManager, RiskConfig
 from apps.executor.strategies import (
+    BaseStrategy,
     StrategyManager,
     MomentumStrategy,
     MeanReversionStrategy
 )
 from apps.executor.profiles import get_profile
 from apps.executor.pnl_logger import PnLLogger
+from apps.executor.log_queue import start_log_listener
 from config.safe_list import get_active_symbols, get_symbol_config
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),  # Console
-        logging.FileHandler('logs/trading_engine.log')  # File
-    ]
-)
+# Log calls only enqueue the record; a listener thread does the console/file I/O
+os.makedirs('logs', exist_ok=True)  # Runtime output only; ignored by git
+_log_handlers = [
+    logging.StreamHandler(),  # Console
+    RotatingFileHandler('logs/trading_engine.log', maxBytes=10 * 1024 * 1024, backupCount=5)  # File
+]
+for _handler in _log_handlers:
+    _handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+_queue_handler, _log_listener = start_log_listener(*_log_handlers)
+logging.basicConfig(level=logging.INFO, handlers=[_queue_handler])
+
 logger = logging.getLogger(__name__)
 
+# Candle cache: bars kept per symbol and how often the REST history is refetched to heal drift
+_CANDLE_HISTORY = 200
+_CANDLE_RESYNC_SECONDS = 300
+_CANDLE_RETRY_SECONDS = 30  # Backoff after a failed REST seed, instead of retrying every tick
+_BALANCE_TTL_SECONDS = 30  # Account balance is refetched at most this often
+_PRICE_STALE_SECONDS = 5  # Feed prices older than this are re-read over REST
+_MAX_DRAIN = 1000  # Messages taken off the ZMQ socket per loop iteration
+_TIMEFRAME_UNIT_MS = {'m': 60_000, 'h': 3_600_000, 'd': 86_400_000, 'w': 604_800_000}
+
+
+def _timeframe_ms(timeframe: str) -> int:
+    """Bar length in milliseconds for a timeframe string ('1m', '15m', '4h', '1d')."""
+    return int(timeframe[:-1]) * _TIMEFRAME_UNIT_MS[timeframe[-1]]
+
+
+def _build_momentum(symbol: str, params: dict) -> BaseStrategy:
+    """Momentum strategy with symbol-specific params."""
+    logger.info(f"[OK] {symbol}: Momentum (RSI={params.get('rsi_period', 9)})")
+    return MomentumStrategy(
+        name=f"Momentum-{symbol}",
+        rsi_period=params.get('rsi_period', 9),
+        fast_ma_period=params.get('ma_fast', 8),
+        slow_ma_period=params.get('ma_slow', 21)
+    )
+
+
+def _build_mean_reversion(symbol: str, params: dict) -> BaseStrategy:
+    """Mean Reversion strategy with symbol-specific params."""
+    logger.info(f"[OK] {symbol}: MeanReversion (BB_std={params.get('bb_std', 2.0)})")
+    return MeanReversionStrategy(
+        name=f"MeanRev-{symbol}",
+        rsi_period=params.get('rsi_period', 14),
+        bb_period=params.get('bb_period', 20),
+        bb_std=params.get('bb_std', 2.0)
+    )
+
+
+@dataclass(slots=True)
+class OpenPosition:
+    """A position opened by the engine, tracked until TP/SL/exit closes it."""
+    side: str  # 'buy' or 'sell'
+    entry_price: float
+    quantity: float
+    stop_loss: float
+    take_profit: float
+    order_id: str
+    timestamp: str  # ISO open time, for logs
+    opened_at: float  # time.monotonic() at open, for position age without datetime parsing
+
+
+# safe_list 'strategy' name -> builder(symbol, params)
+STRATEGY_FACTORY: Dict[str, Callable[[str, dict], BaseStrategy]] = {
+    'momentum': _build_momentum,
+    'mean_reversion': _build_mean_reversion,
+}
+
 
 class MultiSymbolEngine:
     """
@@ -81,18 +159,16 @@ class MultiSymbolEngine:
         logger.info("=" * 60)
         logger.info("MULTI-SYMBOL TRADING ENGINE")
         logger.info("=" * 60)
-        logger.info(f"Symbols: {self.symbols}")
-        logger.info(f"Dry Run: {dry_run}")
+        logger.info("Symbols: %s", self.symbols)
+        logger.info("Dry Run: %s", dry_run)
         logger.info("=" * 60)
-
-        print("Dry Run: ", dry_run)
         
         # Load trading profile
         self.profile = get_profile(settings.TRADING_PROFILE)
-        logger.info(f"Trading Profile: {self.profile.name}")
-        logger.info(f"Combination Method: {self.profile.combination_method}")
-        logger.info(f"Min Confidence: {self.profile.min_confidence:.0%}")
-        logger.info(f"Max Risk per Trade: {self.profile.max_risk_per_trade:.1%}")
+        logger.info("Trading Profile: %s", self.profile.name)
+        logger.info("Combination Method: %s", self.profile.combination_method)
+        logger.info("Min Confidence: %.0f%%", self.profile.min_confidence * 100)
+        logger.info("Max Risk per Trade: %.1f%%", self.profile.max_risk_per_trade * 100)
         
         # Global components
         self.connector = TestnetConnector(use_testnet=use_testnet)
@@ -112,23 +188,61 @@ class MultiSymbolEngine:
         
         # State per symbol (dictionary-based)
         self.strategies: Dict[str, StrategyManager] = {}
-        self.candles: Dict[str, pd.DataFrame] = {}
-        self.latest_candles: Dict[str, pd.DataFrame] = {}
-        self.last_candle_time: Dict[str, datetime] = {}
+        self.candles: Dict[str, CandleBuffer] = {}
+        self._candles_resync_at: Dict[str, float] = {}  # time.monotonic() when the next REST seed is due
+        self._timeframe_ms = _timeframe_ms(settings.DEFAULT_TIMEFRAME)
+        
+        # Strategies run on a new bar, or at most every SIGNAL_CHECK_INTERVAL seconds intrabar
+        self._last_signal_check: Dict[str, float] = {}
+        self._signal_check_interval = settings.SIGNAL_CHECK_INTERVAL
+        
+        # safe_list config and per-trade limits, resolved once in _initialize_strategies
+        self._symbol_cfg: Dict[str, dict] = {}
+        self._max_position_usd: Dict[str, float] = {}
+        self._tp_rr_ratio = float(getattr(settings, 'TP_RR_RATIO', 3.0))  # Default 3:1 for Spot
+        
+        # Latest feed price per symbol (price, monotonic receive time) and cached USDT
+        # balance (value, monotonic expiry), so trades and the monitor do not hit REST
+        # for data the feed already delivered
+        self._last_price: Dict[str, Tuple[float, float]] = {}
+        self._balance_cache: Tuple[float, float] = (0.0, 0.0)
         
         # Position tracking (prevent duplicate trades)
-        self.open_positions: Dict[str, Dict] = {}  # {symbol: {'side': 'buy', 'entry_price': 71000, 'timestamp': ...}}
+        self.open_positions: Dict[str, OpenPosition] = {}
+        
+        # Symbols with a closing order in flight (tick path and monitor must not both close)
+        self._closing: set = set()
+        
+        # Set while at least one position is open; the monitor sleeps on it instead of polling
+        self._has_open_positions = asyncio.Event()
         
         # Initialize strategies for each symbol (Factory Pattern)
         self._initialize_strategies()
         
         # ZeroMQ Subscriber
-        self.zmq_context = zmq.asyncio.Context()
+        # Two IO threads: one feed connection fans in every symbol's ticks
+        self.zmq_context = zmq.asyncio.Context(io_threads=2)
         self.zmq_socket = self.zmq_context.socket(zmq.SUB)
+        # Must be set before connect(): room for new-bar bursts, and no
+        # blocking on queued messages when the socket is closed
+        self.zmq_socket.setsockopt(zmq.RCVHWM, 10000)
+        self.zmq_socket.setsockopt(zmq.LINGER, 0)
+        # Blocking view of the same socket, used to take already-queued messages
+        # without creating a Future or registering a reader on the event loop
+        self._zmq_nowait = zmq.Socket.shadow(self.zmq_socket.underlying)
+        # Topic bytes -> symbol, so routing needs no decode and untracked topics a single lookup.
+        # zmq.CONFLATE is not used: it keeps one message for the whole socket, not one per
+        # topic, and does not support the multipart [topic, data] frames.
+        self._topic_symbols = {symbol.encode('utf-8'): symbol for symbol in self.symbols}
+        
+        # One tick handler task per busy symbol, plus the newest frame that arrived while it ran
+        self._tick_tasks: Dict[str, asyncio.Task] = {}
+        self._pending_ticks: Dict[str, zmq.Frame] = {}
         
         # Control
         self.running = False
         self.tick_count = 0  # Contador para debugging
+        self._no_signal_count: Dict[str, int] = defaultdict(int)  # Checks without a signal, per symbol
         
     def _initialize_strategies(self):
         """
@@ -156,35 +270,20 @@ class MultiSymbolEngine:
             strategy_type = config.get('strategy', 'mean_reversion')
             params = config.get('params', {})
             
-            if strategy_type == 'momentum':
-                # Create Momentum strategy with symbol-specific params
-                momentum = MomentumStrategy(
-                    name=f"Momentum-{symbol}",
-                    rsi_period=params.get('rsi_period', 9),
-                    fast_ma_period=params.get('ma_fast', 8),
-                    slow_ma_period=params.get('ma_slow', 21)
-                )
-                strategy_manager.register_strategy(momentum)
-                logger.info(f"[OK] {symbol}: Momentum (RSI={params.get('rsi_period', 9)})")
-                
-            elif strategy_type == 'mean_reversion':
-                # Create Mean Reversion strategy with symbol-specific params
-                mean_rev = MeanReversionStrategy(
-                    name=f"MeanRev-{symbol}",
-                    rsi_period=params.get('rsi_period', 14),
-                    bb_period=params.get('bb_period', 20),
-                    bb_std=params.get('bb_std', 2.0)
-                )
-                strategy_manager.register_strategy(mean_rev)
-                logger.info(f"[OK] {symbol}: MeanReversion (BB_std={params.get('bb_std', 2.0)})")
+            build = STRATEGY_FACTORY.get(strategy_type)
+            if build is not None:
+                strategy_manager.register_strategy(build(symbol, params))
+            else:
+                logger.warning(f"Unknown strategy '{strategy_type}' for {symbol}, no strategy registered")
             
-            # Store strategy manager for this symbol
+            # Store strategy manager and config for this symbol
             self.strategies[symbol] = strategy_manager
+            self._symbol_cfg[symbol] = config
+            self._max_position_usd[symbol] = float(config.get('max_position_size_usd', 1000))
             
             # Initialize state
-            self.candles[symbol] = pd.DataFrame()
-            self.latest_candles[symbol] = None
-            self.last_candle_time[symbol] = None
+            self.candles[symbol] = CandleBuffer(_CANDLE_HISTORY)
+            self._last_signal_check[symbol] = float('-inf')
         
         logger.info("=" * 60 + "\n")
     
@@ -204,6 +303,10 @@ class MultiSymbolEngine:
         await self.connector.initialize()
         logger.info("Testnet connector initialized")
         
+        # Seed the candle cache once; ticks keep it current from here on
+        for symbol in self.strategies:
+            await self._seed_candles(symbol)
+        
         # Start main loop and position monitoring in parallel
         self.running = True
         
@@ -227,35 +330,73 @@ class MultiSymbolEngine:
         Event-driven architecture:
         - ZMQ publishes: [topic: 'BTC/USDT', data: {...}]
         - Engine receives and routes to on_tick(symbol, data)
+        
+        Each wakeup drains everything already queued (up to _MAX_DRAIN
+        messages) and keeps only the newest message per symbol: stale ticks
+        are never decoded. Each symbol's ticks run in their own task, one at
+        a time, so a slow REST call for one symbol (resync, order) neither
+        blocks the socket nor the other symbols. Bar extremes missed by
+        dropped ticks are restored by the periodic REST resync.
         """
         logger.info("\n[RUNNING] Trading Engine - Event-driven mode\n")
         
-        last_message_time = asyncio.get_event_loop().time()
         heartbeat_timeout = 60  # seconds without data = warning
         
+        # Per-message lookups bound once as locals
+        recv_nowait = self._zmq_nowait.recv_multipart
+        recv = self.zmq_socket.recv_multipart
+        topic_symbols = self._topic_symbols
+        tick_tasks = self._tick_tasks
+        pending_ticks = self._pending_ticks
+        run_ticks = self._run_ticks
+        noblock = zmq.NOBLOCK
+        
         try:
             while self.running:
                 try:
-                    # Receive message with timeout
-                    topic, msg = await asyncio.wait_for(
-                        self.zmq_socket.recv_multipart(),
-                        timeout=heartbeat_timeout
-                    )
+                    try:
+                        # Optimistic path: a message is usually already queued
+                        frames = recv_nowait(noblock, copy=False)
+                    except zmq.Again:
+                        # Nothing queued: wait with timeout (zero-copy frames)
+                        frames = await asyncio.wait_for(
+                            recv(copy=False),
+                            timeout=heartbeat_timeout
+                        )
                     
-                    last_message_time = asyncio.get_event_loop().time()
+                    # Drain the rest of the burst, keeping only the newest message per symbol
+                    latest: Dict[str, zmq.Frame] = {}
+                    drained = 0
+                    while True:
+                        topic, msg = frames
+                        symbol = topic_symbols.get(topic.bytes)
+                        
+                        if symbol is not None:
+                            latest[symbol] = msg
+                        else:
+                            logger.debug("Received tick for non-tracked symbol: %r", topic.bytes)
+                        
+                        drained += 1
+                        if drained == _MAX_DRAIN:
+                            break
+                        try:
+                            frames = recv_nowait(noblock, copy=False)
+                        except zmq.Again:
+                            break
                     
-                    symbol = topic.decode('utf-8')
-                    data = msgpack.unpackb(msg, raw=False)
+                    # Route to per-symbol handlers; a busy symbol keeps only its newest tick
+                    for symbol, msg in latest.items():
+                        if symbol in tick_tasks:
+                            pending_ticks[symbol] = msg
+                        else:
+                            tick_tasks[symbol] = asyncio.create_task(run_ticks(symbol, msg))
                     
-                    # Route to symbol-specific handler
-                    if symbol in self.symbols:
-                        await self.on_tick(symbol, data)
-                    else:
-                        logger.debug(f"Received tick for non-tracked symbol: {symbol}")
+                    # Let the handlers run before reading the socket again
+                    await asyncio.sleep(0)
                 
                 except asyncio.TimeoutError:
                     # No data received for 60 seconds
-                    logger.warning(f"️ No data received for {heartbeat_timeout}s - feed handler may be stuck")
+                    logger.warning("️ No data received for %ss - feed handler may be stuck", heartbeat_timeout)
                     logger.warning("Checking if feed handler is still alive...")
                     # Continue waiting (don't crash)
                     continue
@@ -263,7 +404,7 @@ class MultiSymbolEngine:
         except KeyboardInterrupt:
             logger.info("Shutting down...")
         except Exception as e:
-            logger.error(f"Error in main loop: {e}", exc_info=True)
+            logger.error("Error in main loop: %s", e, exc_info=True)
         finally:
             await self.stop()
     
@@ -272,11 +413,12 @@ class MultiSymbolEngine:
         Handle incoming tick for specific symbol.
         
         Workflow per symbol:
-        1. Update candles (OHLCV data)
-        2. Run strategy
-        3. Check for signal
-        4. Portfolio risk check
-        5. Execute trade
+        1. Enforce TP/SL on an open position
+        2. Update candles (OHLCV data)
+        3. Run strategy (on a new bar or once the intrabar throttle expires)
+        4. Check for signal
+        5. Portfolio risk check
+        6. Execute trade
         
         Args:
             symbol: Trading pair (e.g., 'BTC/USDT')
@@ -288,51 +430,163 @@ class MultiSymbolEngine:
             
             # Log cada 100 ticks para confirmar actividad
             if self.tick_count % 100 == 0:
-                logger.info(f"[STATS] Processed {self.tick_count} ticks total")
+                logger.info("[STATS] Processed %d ticks total", self.tick_count)
+            
+            price = tick_data.get('last')
+            if price is not None:
+                now = time.monotonic()
+                self._last_price[symbol] = (price, now)
+                
+                # Enforce TP/SL at tick speed instead of waiting for the monitor
+                if symbol in self.open_positions:
+                    await self._check_position(symbol, price, now)
             
             # Update candles for this symbol
-            await self._update_candles(symbol)
+            candles = self.candles[symbol]
+            previous_bar = candles.last_time
+            await self._update_candles(symbol, tick_data)
             
-            # Check for signals
-            if self.latest_candles[symbol] is not None:
-                await self._check_signal(symbol)
+            # Check for signals (indicators over unchanged bars give the same answer)
+            if len(candles):
+                now = time.monotonic()
+                if (candles.last_time != previous_bar
+                        or now - self._last_signal_check[symbol] >= self._signal_check_interval):
+                    self._last_signal_check[symbol] = now
+                    await self._check_signal(symbol)
                 
         except Exception as e:
-            logger.error(f"Error processing {symbol}: {e}", exc_info=True)
+            logger.error("Error processing %s: %s", symbol, e, exc_info=True)
+    
+    async def _run_ticks(self, symbol: str, msg: zmq.Frame):
+        """
+        Decode and handle ticks for one symbol, one at a time.
+        
+        After each tick, continues with the newest frame _main_loop parked in
+        _pending_ticks while it ran (if any); older ones were already dropped.
+        """
+        try:
+            while msg is not None:
+                try:
+                    tick_data = _decode_tick(msg.buffer)
+                except Exception as e:
+                    logger.error("%s: Undecodable tick: %s", symbol, e)
+                else:
+                    await self.on_tick(symbol, tick_data)
+                msg = self._pending_ticks.pop(symbol, None)
+        finally:
+            del self._tick_tasks[symbol]
+    
+    async def _get_price(self, symbol: str) -> Optional[float]:
+        """
+        Current price for a symbol: the latest feed tick, or REST when there is
+        no tick yet or it is older than _PRICE_STALE_SECONDS (feed gone quiet).
+        
+        Args:
+            symbol: Trading pair
+        """
+        price, received_at = self._last_price.get(symbol, (None, 0.0))
+        if price is None or time.monotonic() - received_at > _PRICE_STALE_SECONDS:
+            ticker = await self.connector.get_ticker(symbol)
+            if ticker and 'last' in ticker:
+                price = ticker['last']
+        return price
+    
+    async def _get_balance(self) -> float:
+        """Free USDT balance, refetched at most every _BALANCE_TTL_SECONDS."""
+        balance, expires_at = self._balance_cache
+        now = time.monotonic()
+        if now < expires_at:
+            return balance
+        
+        balance_dict = await self.connector.get_balance()
+        
+        # Extract USDT balance (get_balance returns dict)
+        if isinstance(balance_dict, dict):
+            balance = balance_dict.get('USDT', {}).get('free', 0)
+        else:
+            balance = balance_dict  # Fallback if it's already a number
+        
+        self._balance_cache = (balance, now + _BALANCE_TTL_SECONDS)
+        return balance
     
-    async def _update_candles(self, symbol: str):
+    async def _seed_candles(self, symbol: str):
         """
-        Fetch and update OHLCV candles for specific symbol.
+        Fetch OHLCV history over REST and rebuild the candle cache for a symbol.
+        
+        Called once on start and then every _CANDLE_RESYNC_SECONDS to heal
+        any drift between the tick-built bars and the exchange's. A failed
+        attempt is retried after _CANDLE_RETRY_SECONDS, not on the next tick.
         
         Args:
             symbol: Trading pair
         """
+        retry_in = _CANDLE_RETRY_SECONDS
         try:
-            # Determine required candles based on strategy
-            required_candles = 100  # Buffer for indicators
-            
-            # Fetch OHLCV
             ohlcv = await self.connector.fetch_ohlcv(
                 symbol=symbol,
                 timeframe=settings.DEFAULT_TIMEFRAME,
-                limit=required_candles + 10
+                limit=_CANDLE_HISTORY
             )
+            if not ohlcv:
+                logger.warning("%s: No OHLCV history returned", symbol)
+                return
             
-            # Convert to DataFrame
-            df = pd.DataFrame(
-                ohlcv,
-                columns=['timestamp', 'open', 'high', 'low', 'close', 'volume']
-            )
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+            candles = self.candles[symbol]
+            candles.seed(ohlcv)
+            retry_in = _CANDLE_RESYNC_SECONDS
+            
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "%s: Seeded %d candles, last at %s",
+                    symbol, len(candles), pd.Timestamp(candles.last_time, unit='ms')
+                )
+            
+        except Exception as e:
+            logger.error("Error seeding candles for %s: %s", symbol, e, exc_info=True)
+        
+        finally:
+            self._candles_resync_at[symbol] = time.monotonic() + retry_in
+    
+    async def _update_candles(self, symbol: str, tick_data: Dict):
+        """
+        Fold a tick into the cached OHLCV candles for a specific symbol.
+        
+        Ticks inside the current bar only move its high/low/close; a tick in
+        a new bar appends one row and drops the oldest, so the cache stays at
+        _CANDLE_HISTORY bars. The ticker only carries 24h volume, so volume
+        of tick-built bars stays 0 until the next REST resync fills it in.
+        
+        Args:
+            symbol: Trading pair
+            tick_data: Normalized ticker data from feed handler
+        """
+        try:
+            resync_at = self._candles_resync_at.get(symbol)
+            if resync_at is None or time.monotonic() >= resync_at:
+                # Reseed, then still fold this tick in so it is not lost
+                await self._seed_candles(symbol)
+            
+            candles = self.candles[symbol]
+            price = tick_data.get('last')
+            timestamp = tick_data.get('timestamp')
+            if price is None or timestamp is None or not len(candles):
+                return
             
-            self.latest_candles[symbol] = df
-            self.last_candle_time[symbol] = df['timestamp'].iloc[-1]
+            timestamp = int(timestamp)
+            bucket = timestamp - timestamp % self._timeframe_ms
+            last_bucket = candles.last_time
             
-            # Cambiar a INFO para ver actividad
-            logger.info(f"{symbol}: Updated {len(df)} candles, last at {self.last_candle_time[symbol]}")
+            if bucket == last_bucket:
+                # Still inside the open bar: patch the last row in place
+                candles.update(price)
+            
+            elif bucket > last_bucket:
+                # New bar: append one row and drop the oldest one
+                candles.append(bucket, price)
+                logger.debug("%s: New candle at %d", symbol, bucket)
             
         except Exception as e:
-            logger.error(f"Error updating candles for {symbol}: {e}", exc_info=True)
+            logger.error("Error updating candles for %s: %s", symbol, e, exc_info=True)
     
     async def _check_signal(self, symbol: str):
         """
@@ -342,25 +596,26 @@ class MultiSymbolEngine:
             symbol: Trading pair
         """
         try:
-            candles = self.latest_candles[symbol]
+            candles = self.candles[symbol]
             strategy_manager = self.strategies[symbol]
             
-            # Get combined signal
-            signal = await strategy_manager.get_combined_signal(
+            # Get combined signal (pure computation, so no await)
+            signal = strategy_manager.get_combined_signal(
                 candles,
                 min_confidence=self.profile.min_confidence
             )
             
             # ENHANCED DEBUG LOGGING
             if signal:
-                # Get latest candle data for debug info
-                latest_close = candles['close'].iloc[-1]
-                
-                logger.debug(f"{symbol} - Signal Generated:")
-                logger.debug(f"  Type: {signal.signal_type.value.upper()}")
-                logger.debug(f"  Confidence: {signal.confidence:.2%}")
-                logger.debug(f"  Price: ${latest_close:,.2f}")
-                logger.debug(f"  Min Required: {self.profile.min_confidence:.2%}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    # Get latest candle data for debug info
+                    latest_close = candles.close[-1]
+                    
+                    logger.debug("%s - Signal Generated:", symbol)
+                    logger.debug("  Type: %s", signal.signal_type.value.upper())
+                    logger.debug("  Confidence: %.2f%%", signal.confidence * 100)
+                    logger.debug(f"  Price: ${latest_close:,.2f}")  # %-format has no digit grouping
+                    logger.debug("  Min Required: %.2f%%", self.profile.min_confidence * 100)
                 
                 # ========================================
                 # SELL SIGNAL → CLOSE LONG POSITION
@@ -371,27 +626,26 @@ class MultiSymbolEngine:
                     existing_position = self.open_positions[symbol]
                     
                     # Only close if it's a LONG position
-                    if existing_position['side'] == 'buy':
+                    if existing_position.side == 'buy':
                         logger.info(
-                            f"[EXIT SIGNAL] {symbol} - SELL signal received, closing LONG position "
-                            f"(confidence: {signal.confidence:.2%})"
+                            "[EXIT SIGNAL] %s - SELL signal received, closing LONG position "
+                            "(confidence: %.2f%%)", symbol, signal.confidence * 100
                         )
                         
                         # Get current price for exit
-                        ticker = await self.connector.get_ticker(symbol)
-                        if ticker and 'last' in ticker:
-                            current_price = ticker['last']
+                        current_price = await self._get_price(symbol)
+                        if current_price is not None:
                             await self.close_position(symbol, 'exit_signal', current_price)
                         return  # Exit after closing
                     else:
-                        logger.debug(f"{symbol}: SELL signal but position is SHORT (already selling)")
+                        logger.debug("%s: SELL signal but position is SHORT (already selling)", symbol)
                         return
                 
                 # Check if actionable (for opening new positions)
                 if signal.is_actionable():
                     logger.info(
-                        f"[SIGNAL] {symbol} - Signal: {signal.signal_type.value.upper()} "
-                        f"(confidence: {signal.confidence:.2%})"
+                        "[SIGNAL] %s - Signal: %s (confidence: %.2f%%)",
+                        symbol, signal.signal_type.value.upper(), signal.confidence * 100
                     )
                     
                     # Execute trade (with portfolio risk check inside)
@@ -399,26 +653,24 @@ class MultiSymbolEngine:
                 else:
                     # Signal exists but below threshold
                     logger.info(
-                        f"[SKIP] {symbol} - Signal FILTERED: {signal.signal_type.value.upper()} "
-                        f"({signal.confidence:.2%} < {self.profile.min_confidence:.2%})"
+                        "[SKIP] %s - Signal FILTERED: %s (%.2f%% < %.2f%%)",
+                        symbol, signal.signal_type.value.upper(),
+                        signal.confidence * 100, self.profile.min_confidence * 100
                     )
             else:
                 # No signal at all - log periodically for awareness
                 # Log every 50th check to avoid spam
-                if not hasattr(self, '_no_signal_count'):
-                    self._no_signal_count = {}
+                self._no_signal_count[symbol] += 1
                 
-                self._no_signal_count[symbol] = self._no_signal_count.get(symbol, 0) + 1
-                
-                if self._no_signal_count[symbol] % 50 == 0:
-                    latest_close = candles['close'].iloc[-1]
+                if self._no_signal_count[symbol] % 50 == 0 and logger.isEnabledFor(logging.DEBUG):
+                    latest_close = candles.close[-1]
                     logger.debug(
                         f"{symbol}: No signal after {self._no_signal_count[symbol]} checks "
                         f"(Price: ${latest_close:,.2f})"
                     )
                 
         except Exception as e:
-            logger.error(f"Error checking signal for {symbol}: {e}", exc_info=True)
+            logger.error("Error checking signal for %s: %s", symbol, e, exc_info=True)
     
     async def _execute_trade(self, symbol: str, signal):
         """
@@ -433,35 +685,30 @@ class MultiSymbolEngine:
         try:
             # Check if we already have an open position for this symbol
             if symbol in self.open_positions:
-                existing = self.open_positions[symbol]
-                logger.info(f"[SKIP] {symbol} - Already have open {existing['side'].upper()} position @ ${existing['entry_price']:,.2f}")
-                logger.info(f"   Opened: {existing['timestamp']} | Current signal: {signal.signal_type.value.upper()}")
+                if logger.isEnabledFor(logging.INFO):
+                    existing = self.open_positions[symbol]
+                    logger.info(
+                        f"[SKIP] {symbol} - Already have open {existing.side.upper()} position @ ${existing.entry_price:,.2f}\n"
+                        f"   Opened: {existing.timestamp} | Current signal: {signal.signal_type.value.upper()}"
+                    )
                 return  # Skip this signal
             
             # Get current price
-            ticker = await self.connector.get_ticker(symbol)
-            if not ticker or 'last' not in ticker:
-                logger.error(f"{symbol}: Unable to get current price")
+            current_price = await self._get_price(symbol)
+            if current_price is None:
+                logger.error("%s: Unable to get current price", symbol)
                 return
             
-            current_price = ticker['last']
-            
             # Get account balance
-            balance_dict = await self.connector.get_balance()
-            
-            # Extract USDT balance (get_balance returns dict)
-            if isinstance(balance_dict, dict):
-                balance = balance_dict.get('USDT', {}).get('free', 0)
-            else:
-                balance = balance_dict  # Fallback if it's already a number
+            balance = await self._get_balance()
                 
             if not balance or balance <= 0:
-                logger.error(f"{symbol}: Invalid balance: {balance}")
+                logger.error("%s: Invalid balance: %s", symbol, balance)
                 return
             
             # Calculate stop loss usando ATR
             stop_loss = self.risk_manager.calculate_dynamic_stop_loss(
-                df=self.latest_candles[symbol],
+                df=self.candles[symbol],
                 current_price=current_price,
                 side='long' if signal.signal_type.value == 'buy' else 'short'
             )
@@ -479,35 +726,31 @@ class MultiSymbolEngine:
             )
             
             if quantity <= 0:
-                logger.warning(f" {symbol} - Position size too small: {quantity}")
+                logger.warning(" %s - Position size too small: %s", symbol, quantity)
                 return
             
-            # Get safe_list config for position limits
-            config = get_symbol_config(symbol)
-            max_position_usd = config.get('max_position_size_usd', 1000)
-            
-            # Respect max position size
-            position_value_usd = quantity * current_price
-            if position_value_usd > max_position_usd:
-                quantity = max_position_usd / current_price
-                position_value_usd = max_position_usd
-            
-            # Log trade details
-            logger.info(f"\n{'='*60}")
-            logger.info(f"TRADE EXECUTION: {symbol}")
-            logger.info(f"{'='*60}")
-            logger.info(f"Signal: {signal.signal_type.value.upper()}")
-            logger.info(f"Confidence: {signal.confidence:.2%}")
-            logger.info(f"Current Price: ${current_price:,.2f}")
-            logger.info(f"Position Size: ${position_value_usd:,.2f} ({quantity:.6f} units)")
-            logger.info(f"Stop Loss: ${stop_loss:,.2f}")
-            risk_amount = abs(current_price - stop_loss) * quantity
-            logger.info(f"Risk Amount: ${risk_amount:,.2f}")
-            logger.info(f"Account Balance: ${balance:,.2f}")
+            # Respect max position size (safe_list limit, cached at startup)
+            quantity = min(quantity, self._max_position_usd[symbol] / current_price)
+            
+            # Log trade details as one record (skipped entirely when INFO is off)
+            if logger.isEnabledFor(logging.INFO):
+                position_value_usd = quantity * current_price
+                risk_amount = abs(current_price - stop_loss) * quantity
+                logger.info(
+                    f"\n{'='*60}\n"
+                    f"TRADE EXECUTION: {symbol}\n"
+                    f"{'='*60}\n"
+                    f"Signal: {signal.signal_type.value.upper()}\n"
+                    f"Confidence: {signal.confidence:.2%}\n"
+                    f"Current Price: ${current_price:,.2f}\n"
+                    f"Position Size: ${position_value_usd:,.2f} ({quantity:.6f} units)\n"
+                    f"Stop Loss: ${stop_loss:,.2f}\n"
+                    f"Risk Amount: ${risk_amount:,.2f}\n"
+                    f"Account Balance: ${balance:,.2f}"
+                )
             
             if self.dry_run:
-                logger.info(f" DRY RUN MODE - Trade NOT executed")
-                logger.info(f"{'='*60}\n")
+                logger.info(" DRY RUN MODE - Trade NOT executed\n" + "=" * 60 + "\n")
                 return
             
             # Execute order
@@ -520,11 +763,11 @@ class MultiSymbolEngine:
             )
             
             if order_result:
-                logger.info(f" {symbol} - Order placed successfully")
-                logger.info(f"Order ID: {order_result.get('id', 'N/A')}")
+                self._balance_cache = (0.0, 0.0)  # Order filled: balance changed
+                logger.info(" %s - Order placed successfully\nOrder ID: %s", symbol, order_result.get('id', 'N/A'))
                 
-                # Get TP/SL configuration from .env (Spot optimized)
-                tp_rr_ratio = float(getattr(settings, 'TP_RR_RATIO', 3.0))  # Default 3:1 for Spot
+                # TP/SL configuration from .env (Spot optimized, read once at startup)
+                tp_rr_ratio = self._tp_rr_ratio
                 
                 # Calculate Take Profit/Stop Loss for SPOT (Wide TP/SL)
                 # SPOT Strategy: Swing trading with wide stops to capture full trends
@@ -535,27 +778,37 @@ class MultiSymbolEngine:
                 else:  # sell
                     take_profit = current_price - (distance_to_sl * tp_rr_ratio)
                 
-                # Calculate projected profit percentage
-                profit_pct = (distance_to_sl * tp_rr_ratio) / current_price * 100
-                risk_pct = distance_to_sl / current_price * 100
-                
-                logger.info(f" SPOT Trade Setup (Swing Trading):")
-                logger.info(f"   TP Distance: ${distance_to_sl * tp_rr_ratio:.2f} (+{profit_pct:.2f}%)")
-                logger.info(f"   SL Distance: ${distance_to_sl:.2f} (-{risk_pct:.2f}%)")
-                logger.info(f"   Risk/Reward: 1:{tp_rr_ratio:.1f}")
+                if logger.isEnabledFor(logging.INFO):
+                    # Calculate projected profit percentage
+                    profit_pct = (distance_to_sl * tp_rr_ratio) / current_price * 100
+                    risk_pct = distance_to_sl / current_price * 100
+                    
+                    logger.info(
+                        " SPOT Trade Setup (Swing Trading):\n"
+                        "   TP Distance: $%.2f (+%.2f%%)\n"
+                        "   SL Distance: $%.2f (-%.2f%%)\n"
+                        "   Risk/Reward: 1:%.1f",
+                        distance_to_sl * tp_rr_ratio, profit_pct, distance_to_sl, risk_pct, tp_rr_ratio
+                    )
                 
                 # Track position to prevent duplicate trades
-                self.open_positions[symbol] = {
-                    'side': signal.signal_type.value,
-                    'entry_price': current_price,
-                    'quantity': quantity,
-                    'stop_loss': stop_loss,
-                    'take_profit': take_profit,
-                    'order_id': order_result.get('id', 'N/A'),
-                    'timestamp': datetime.now().isoformat()
-                }
-                logger.info(f" Position tracked: {symbol} {signal.signal_type.value.upper()} @ ${current_price:,.2f}")
-                logger.info(f"   TP: ${take_profit:,.2f} | SL: ${stop_loss:,.2f}")
+                now = datetime.now()  # One timestamp for the position and the P&L log
+                self.open_positions[symbol] = OpenPosition(
+                    side=signal.signal_type.value,
+                    entry_price=current_price,
+                    quantity=quantity,
+                    stop_loss=stop_loss,
+                    take_profit=take_profit,
+                    order_id=order_result.get('id', 'N/A'),
+                    timestamp=now.isoformat(),
+                    opened_at=time.monotonic()
+                )
+                self._has_open_positions.set()
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info(
+                        f" Position tracked: {symbol} {signal.signal_type.value.upper()} @ ${current_price:,.2f}\n"
+                        f"   TP: ${take_profit:,.2f} | SL: ${stop_loss:,.2f}"
+                    )
                 
                 # Log entry to P&L tracker
                 self.pnl_logger.log_trade_entry(
@@ -564,28 +817,118 @@ class MultiSymbolEngine:
                     entry_price=current_price,
                     quantity=quantity,
                     order_id=order_result.get('id', 'N/A'),
-                    timestamp=datetime.now()
+                    timestamp=now
                 )
                 
                 # TODO: Implement position tracking in AccountManager when method exists
                 # self.account_manager.add_position(...)
             else:
-                logger.error(f" {symbol} - Order failed")
+                logger.error(" %s - Order failed", symbol)
             
-            logger.info(f"{'='*60}\n")
+            logger.info("=" * 60 + "\n")
                 
         except Exception as e:
-            logger.error(f"Error executing trade for {symbol}: {e}", exc_info=True)
+            logger.error("Error executing trade for %s: %s", symbol, e, exc_info=True)
+    
+    async def _check_position(self, symbol: str, current_price: float, now: float):
+        """
+        Apply trailing SL, stagnation exit and TP/SL checks to one open position.
+        
+        Runs on every tick of a symbol with an open position, and from the
+        monitor loop as a safety net.
+        
+        Args:
+            symbol: Trading pair
+            current_price: Current market price
+            now: time.monotonic() of this check
+        """
+        position = self.open_positions.get(symbol)
+        if position is None or symbol in self._closing:
+            return
+        
+        entry_price = position.entry_price
+        take_profit = position.take_profit
+        stop_loss = position.stop_loss
+        side = position.side
+        
+        # ========================================
+        # TRAILING STOP LOSS (LONG POSITIONS)
+        # ========================================
+        if side == 'buy':
+            profit_pct = (current_price - entry_price) / entry_price
+            
+            # Trailing at +5% profit (2% below current)
+            if profit_pct >= 0.05:
+                trailing_sl = current_price * 0.98  # 2% below
+                if trailing_sl > stop_loss:
+                    position.stop_loss = trailing_sl
+                    logger.info(
+                        "[TRAILING SL] %s updated to $%.2f (trailing 2%%, profit: %.2f%%)",
+                        symbol, trailing_sl, profit_pct * 100
+                    )
+                    stop_loss = trailing_sl  # Update for checks below
+            
+            # Breakeven at +3% profit
+            elif profit_pct >= 0.03 and stop_loss < entry_price:
+                breakeven_sl = entry_price
+                position.stop_loss = breakeven_sl
+                logger.info(
+                    "[BREAKEVEN SL] %s updated to $%.2f (profit: %.2f%%)",
+                    symbol, breakeven_sl, profit_pct * 100
+                )
+                stop_loss = breakeven_sl
+        
+        # ========================================
+        # STAGNATION EXIT (CAPITAL ROTATION)
+        # ========================================
+        hours_open = (now - position.opened_at) / 3600
+        
+        if side == 'buy':
+            profit_pct = (current_price - entry_price) / entry_price
+        else:
+            profit_pct = (entry_price - current_price) / entry_price
+        
+        # Close stagnant positions (>24h, <1% profit)
+        if hours_open > 24 and profit_pct < 0.01:
+            logger.info(
+                "[STAGNATION EXIT] %s - Open %.1fh, Profit %.2f%% < 1%% - Rotating capital",
+                symbol, hours_open, profit_pct * 100
+            )
+            await self.close_position(symbol, 'stagnation', current_price)
+            return  # Skip TP/SL checks (already closed)
+        
+        # ========================================
+        # STANDARD TP/SL CHECKS
+        # ========================================
+        # Check Take Profit
+        if side == 'buy' and current_price >= take_profit:
+            logger.info("✅ %s - TAKE PROFIT HIT!", symbol)
+            await self.close_position(symbol, 'take_profit', current_price)
+        elif side == 'sell' and current_price <= take_profit:
+            logger.info("✅ %s - TAKE PROFIT HIT!", symbol)
+            await self.close_position(symbol, 'take_profit', current_price)
+        
+        # Check Stop Loss
+        elif side == 'buy' and current_price <= stop_loss:
+            logger.info("🛑 %s - STOP LOSS HIT!", symbol)
+            await self.close_position(symbol, 'stop_loss', current_price)
+        elif side == 'sell' and current_price >= stop_loss:
+            logger.info("🛑 %s - STOP LOSS HIT!", symbol)
+            await self.close_position(symbol, 'stop_loss', current_price)
     
     async def monitor_open_positions(self):
         """
-        Continuously monitor open positions for Take Profit/Stop Loss.
+        Safety-net scan of open positions for Take Profit/Stop Loss.
         
         NEW FEATURES:
         - Trailing Stop Loss (breakeven at +3%, trailing at +5%)
         - Stagnation Exit (close positions >24h with <1% profit)
         
-        Checks every 2 seconds if positions should be closed.
+        TP/SL are normally enforced in on_tick as prices arrive. This loop
+        re-checks every 2 seconds so stagnation exits still fire and, since
+        _get_price falls back to REST once a symbol's last tick is stale,
+        positions stay covered if its feed goes quiet. It sleeps until a
+        position is opened when there is nothing to monitor.
         """
         logger.info("[MONITOR] Position monitoring started")
         logger.info("[MONITOR] Features: Trailing SL, Stagnation Exit")
@@ -593,98 +936,36 @@ class MultiSymbolEngine:
         try:
             while self.running:
                 if not self.open_positions:
-                    await asyncio.sleep(2)
+                    # Idle until _execute_trade tracks a position (no empty polling)
+                    self._has_open_positions.clear()
+                    await self._has_open_positions.wait()
                     continue
                 
-                for symbol in list(self.open_positions.keys()):
-                    try:
-                        position = self.open_positions[symbol]
-                        
-                        # Get current price
-                        ticker = await self.connector.get_ticker(symbol)
-                        if not ticker or 'last' not in ticker:
-                            continue
-                        
-                        current_price = ticker['last']
-                        entry_price = position['entry_price']
-                        take_profit = position['take_profit']
-                        stop_loss = position['stop_loss']
-                        side = position['side']
-                        
-                        # ========================================
-                        # TRAILING STOP LOSS (LONG POSITIONS)
-                        # ========================================
-                        if side == 'buy':
-                            profit_pct = (current_price - entry_price) / entry_price
-                            
-                            # Trailing at +5% profit (2% below current)
-                            if profit_pct >= 0.05:
-                                trailing_sl = current_price * 0.98  # 2% below
-                                if trailing_sl > stop_loss:
-                                    position['stop_loss'] = trailing_sl
-                                    logger.info(
-                                        f"[TRAILING SL] {symbol} updated to ${trailing_sl:.2f} "
-                                        f"(trailing 2%, profit: {profit_pct:.2%})"
-                                    )
-                                    stop_loss = trailing_sl  # Update for checks below
-                            
-                            # Breakeven at +3% profit
-                            elif profit_pct >= 0.03 and stop_loss < entry_price:
-                                breakeven_sl = entry_price
-                                position['stop_loss'] = breakeven_sl
-                                logger.info(
-                                    f"[BREAKEVEN SL] {symbol} updated to ${breakeven_sl:.2f} "
-                                    f"(profit: {profit_pct:.2%})"
-                                )
-                                stop_loss = breakeven_sl
-                        
-                        # ========================================
-                        # STAGNATION EXIT (CAPITAL ROTATION)
-                        # ========================================
-                        entry_time = datetime.fromisoformat(position['timestamp'])
-                        hours_open = (datetime.now() - entry_time).total_seconds() / 3600
-                        
-                        if side == 'buy':
-                            profit_pct = (current_price - entry_price) / entry_price
-                        else:
-                            profit_pct = (entry_price - current_price) / entry_price
-                        
-                        # Close stagnant positions (>24h, <1% profit)
-                        if hours_open > 24 and profit_pct < 0.01:
-                            logger.info(
-                                f"[STAGNATION EXIT] {symbol} - Open {hours_open:.1f}h, "
-                                f"Profit {profit_pct:.2%} < 1% - Rotating capital"
-                            )
-                            await self.close_position(symbol, 'stagnation', current_price)
-                            continue  # Skip TP/SL checks (already closed)
-                        
-                        # ========================================
-                        # STANDARD TP/SL CHECKS
-                        # ========================================
-                        # Check Take Profit
-                        if side == 'buy' and current_price >= take_profit:
-                            logger.info(f"✅ {symbol} - TAKE PROFIT HIT!")
-                            await self.close_position(symbol, 'take_profit', current_price)
-                        elif side == 'sell' and current_price <= take_profit:
-                            logger.info(f"✅ {symbol} - TAKE PROFIT HIT!")
-                            await self.close_position(symbol, 'take_profit', current_price)
-                        
-                        # Check Stop Loss
-                        elif side == 'buy' and current_price <= stop_loss:
-                            logger.info(f"🛑 {symbol} - STOP LOSS HIT!")
-                            await self.close_position(symbol, 'stop_loss', current_price)
-                        elif side == 'sell' and current_price >= stop_loss:
-                            logger.info(f"🛑 {symbol} - STOP LOSS HIT!")
-                            await self.close_position(symbol, 'stop_loss', current_price)
-                    
-                    except Exception as e:
-                        logger.error(f"Error monitoring {symbol}: {e}")
+                # Check all positions concurrently so any REST price lookups
+                # overlap instead of running one after another
+                now = time.monotonic()
+                await asyncio.gather(
+                    *(self._monitor_position(symbol, now) for symbol in list(self.open_positions)),
+                    return_exceptions=True
+                )
                 
                 await asyncio.sleep(2)  # Check every 2 seconds
                 
         except asyncio.CancelledError:
             logger.info("[MONITOR] Position monitoring stopped")
     
+    async def _monitor_position(self, symbol: str, now: float):
+        """Fetch the price for one open position and run the TP/SL checks on it."""
+        try:
+            current_price = await self._get_price(symbol)
+            if current_price is None:
+                return
+            
+            await self._check_position(symbol, current_price, now)
+        
+        except Exception as e:
+            logger.error("Error monitoring %s: %s", symbol, e)
+    
     async def close_position(self, symbol: str, reason: str, current_price: float):
         """
         Close an open position.
@@ -694,34 +975,41 @@ class MultiSymbolEngine:
             reason: 'take_profit' or 'stop_loss'
             current_price: Current market price
         """
+        if symbol in self._closing:
+            return  # Another path is already closing this position
+        
+        self._closing.add(symbol)
         try:
             position = self.open_positions.get(symbol)
             if not position:
-                logger.warning(f"️ {symbol} - No position found to close")
+                logger.warning("️ %s - No position found to close", symbol)
                 return
             
             # Determine opposite side
-            close_side = 'sell' if position['side'] == 'buy' else 'buy'
+            close_side = 'sell' if position.side == 'buy' else 'buy'
             
             if self.dry_run:
                 # Simulate close in dry run
-                entry = position['entry_price']
-                quantity = position['quantity']
+                entry = position.entry_price
+                quantity = position.quantity
                 
-                if position['side'] == 'buy':
+                if position.side == 'buy':
                     pnl = (current_price - entry) * quantity
                 else:
                     pnl = (entry - current_price) * quantity
                 
-                logger.info(f"{'='*60}")
-                logger.info(f" DRY RUN - POSITION CLOSED: {symbol}")
-                logger.info(f"{'='*60}")
-                logger.info(f"Reason: {reason.upper()}")
-                logger.info(f"Entry Price: ${entry:,.2f}")
-                logger.info(f"Exit Price: ${current_price:,.2f}")
-                logger.info(f"Quantity: {quantity:.6f}")
-                logger.info(f"Simulated PNL: ${pnl:,.2f}")
-                logger.info(f"{'='*60}\n")
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info(
+                        f"{'='*60}\n"
+                        f" DRY RUN - POSITION CLOSED: {symbol}\n"
+                        f"{'='*60}\n"
+                        f"Reason: {reason.upper()}\n"
+                        f"Entry Price: ${entry:,.2f}\n"
+                        f"Exit Price: ${current_price:,.2f}\n"
+                        f"Quantity: {quantity:.6f}\n"
+                        f"Simulated PNL: ${pnl:,.2f}\n"
+                        f"{'='*60}\n"
+                    )
                 
                 del self.open_positions[symbol]
                 return
@@ -730,34 +1018,37 @@ class MultiSymbolEngine:
             order_result = await self.connector.place_order(
                 symbol=symbol,
                 side=close_side,
-                quantity=position['quantity'],
+                quantity=position.quantity,
                 price=current_price,
                 order_type='market'
             )
             
             if order_result:
-                entry = position['entry_price']
-                quantity = position['quantity']
+                self._balance_cache = (0.0, 0.0)  # Order filled: balance changed
+                entry = position.entry_price
+                quantity = position.quantity
                 
-                if position['side'] == 'buy':
+                if position.side == 'buy':
                     pnl = (current_price - entry) * quantity
                 else:
                     pnl = (entry - current_price) * quantity
                 
-                logger.info(f"{'='*60}")
-                logger.info(f"POSITION CLOSED: {symbol}")
-                logger.info(f"{'='*60}")
-                logger.info(f"Reason: {reason.upper()}")
-                logger.info(f"Entry Price: ${entry:,.2f}")
-                logger.info(f"Exit Price: ${current_price:,.2f}")
-                logger.info(f"Quantity: {quantity:.6f}")
-                
                 # Calculate ROI
                 roi = (pnl / (entry * quantity)) * 100
                 
-                logger.info(f"Realized PNL: ${pnl:,.2f} ({'+' if pnl > 0 else ''}{roi:.2f}%)")
-                logger.info(f"Order ID: {order_result.get('id', 'N/A')}")
-                logger.info(f"{'='*60}\n")
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info(
+                        f"{'='*60}\n"
+                        f"POSITION CLOSED: {symbol}\n"
+                        f"{'='*60}\n"
+                        f"Reason: {reason.upper()}\n"
+                        f"Entry Price: ${entry:,.2f}\n"
+                        f"Exit Price: ${current_price:,.2f}\n"
+                        f"Quantity: {quantity:.6f}\n"
+                        f"Realized PNL: ${pnl:,.2f} ({'+' if pnl > 0 else ''}{roi:.2f}%)\n"
+                        f"Order ID: {order_result.get('id', 'N/A')}\n"
+                        f"{'='*60}\n"
+                    )
                 
                 # Log exit to P&L tracker
                 self.pnl_logger.log_trade_exit(
@@ -774,16 +1065,24 @@ class MultiSymbolEngine:
                 # Remove from tracking
                 del self.open_positions[symbol]
             else:
-                logger.error(f" {symbol} - Failed to close position")
+                logger.error(" %s - Failed to close position", symbol)
         
         except Exception as e:
-            logger.error(f"Error closing position for {symbol}: {e}", exc_info=True)
+            logger.error("Error closing position for %s: %s", symbol, e, exc_info=True)
+        finally:
+            self._closing.discard(symbol)
     
     async def stop(self):
         """Stop the engine and cleanup resources."""
         logger.info("Stopping Multi-Symbol Trading Engine...")
         self.running = False
         
+        # Cancel in-flight tick handlers before their connector goes away
+        tick_tasks = list(self._tick_tasks.values())
+        for task in tick_tasks:
+            task.cancel()
+        await asyncio.gather(*tick_tasks, return_exceptions=True)
+        
         await self.connector.close()
         self.zmq_socket.close()
         self.zmq_context.term()
@@ -804,6 +1103,7 @@ async def main():
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        # uvloop cuts the per-wakeup cost of the ZMQ reader when installed
+        (uvloop.run if uvloop is not None else asyncio.run)(main())
     except KeyboardInterrupt:
         logger.info("Multi-Symbol Engine stopped by user")
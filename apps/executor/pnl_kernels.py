@@ -0,0 +1,37 @@
+"""
+P&L Kernels - Mark-to-market arithmetic over the AccountManager position arrays
+Compiled with Numba when available; plain NumPy/Python otherwise.
+"""
+import numpy as np
+
+from apps.analytics.indicators import njit
+
+
+@njit(cache=True, fastmath=True)
+def update_pnl_batch(side_sign, entry, size, price, out_pnl, out_roi):
+    """
+    Unrealized P&L and ROI % for every position row.
+
+    side_sign (int8) is +1 for LONG and -1 for SHORT, so both sides share
+    one branch-free formula. Results are written into out_pnl / out_roi in place.
+    """
+    for i in range(price.shape[0]):
+        out_pnl[i] = side_sign[i] * (price[i] - entry[i]) * size[i]
+        inv = entry[i] * size[i]
+        out_roi[i] = 0.0 if inv == 0 else out_pnl[i] / inv * 100.0
+
+
+@njit(cache=True)
+def close_pnl(side_sign, entry, size, exit_price):
+    """Realized P&L of closing one position at exit_price."""
+    return side_sign * (exit_price - entry) * size
+
+
+def _warm_up():
+    """Compile (or load from cache) the kernels at import, not on the first tick."""
+    ones = np.ones(1)
+    update_pnl_batch(np.ones(1, dtype=np.int8), ones, ones, ones, np.empty(1), np.empty(1))
+    close_pnl(np.int8(1), 1.0, 1.0, 1.0)
+
+
+_warm_up()
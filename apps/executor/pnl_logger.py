@@ -9,10 +9,53 @@ Logs to: logs/pnl_tracker.log
 - ROI tracking
 """
 import logging
-from datetime import datetime, date
+import time
+from logging.handlers import QueueListener
+from dataclasses import dataclass
+from datetime import datetime, date, timedelta
 from typing import Optional, Dict
 from pathlib import Path
 
+from apps.executor.log_queue import start_log_listener, stop_log_listener
+
+# Listener of the current PnLLogger; replaced (and stopped) when a new one is created
+_log_listener: Optional[QueueListener] = None
+
+# Daily summary box, 78 columns between the borders; filled with one str.format per summary
+_SUMMARY_BOX = (
+    "\n┌" + "─" * 78 + "┐\n"
+    "│{title:^78}│\n"
+    "├" + "─" * 78 + "┤\n"
+    "│  Total P&L:      {total:<60}│\n"
+    "│  Total Trades:   {trades:<60}│\n"
+    "│  Wins:           {wins:<60}│\n"
+    "│  Losses:         {losses:<60}│\n"
+    "{averages}"
+    "└" + "─" * 78 + "┘\n"
+)
+_SUMMARY_ROW = "│  {label:<16}{value:<60}│\n"
+
+
+@dataclass(slots=True)
+class _DayStats:
+    """Running P&L aggregates for one day, updated per exit instead of rescanning the day's trades."""
+    total_pnl: float = 0.0
+    trades: int = 0
+    wins: int = 0
+    losses: int = 0
+    win_sum: float = 0.0
+    loss_sum: float = 0.0
+    
+    def add(self, pnl: float):
+        self.total_pnl += pnl
+        self.trades += 1
+        if pnl > 0:
+            self.wins += 1
+            self.win_sum += pnl
+        elif pnl < 0:
+            self.losses += 1
+            self.loss_sum += pnl
+
 
 class PnLLogger:
     """Dedicated P&L tracking logger."""
@@ -24,6 +67,8 @@ class PnLLogger:
         Args:
             log_file: Path to P&L log file
         """
+        global _log_listener
+        
         # Create logs directory if it doesn't exist
         Path(log_file).parent.mkdir(parents=True, exist_ok=True)
         
@@ -31,9 +76,6 @@ class PnLLogger:
         self.logger = logging.getLogger("PnL_Tracker")
         self.logger.setLevel(logging.INFO)
         
-        # Remove any existing handlers
-        self.logger.handlers = []
-        
         # File handler
         file_handler = logging.FileHandler(log_file)
         file_handler.setLevel(logging.INFO)
@@ -45,16 +87,22 @@ class PnLLogger:
         )
         file_handler.setFormatter(formatter)
         
-        self.logger.addHandler(file_handler)
-        
         # Also log to console for visibility
         console_handler = logging.StreamHandler()
         console_handler.setLevel(logging.INFO)
         console_handler.setFormatter(formatter)
-        self.logger.addHandler(console_handler)
+        
+        # Trades only enqueue their records; a listener thread does the file/console I/O.
+        # The logger is shared, so the previous instance's listener (thread and file) is stopped.
+        if _log_listener is not None:
+            stop_log_listener(_log_listener)
+        queue_handler, _log_listener = start_log_listener(file_handler, console_handler)
+        self.logger.handlers = [queue_handler]
         
         # Daily tracking
-        self.daily_trades: Dict[str, list] = {}  # {date: [pnl1, pnl2, ...]}
+        self._stats_by_day: Dict[str, _DayStats] = {}  # {date: running totals}
+        self._today_str = ""
+        self._day_ends_at = 0.0  # Epoch seconds of the next local midnight
         
         # Log initialization
         self.logger.info("=" * 80)
@@ -131,10 +179,11 @@ class PnLLogger:
             result = "NEUTRAL"
         
         # Track daily P&L
-        today = date.today().isoformat()
-        if today not in self.daily_trades:
-            self.daily_trades[today] = []
-        self.daily_trades[today].append(pnl)
+        today = self._today()
+        stats = self._stats_by_day.get(today)
+        if stats is None:
+            stats = self._stats_by_day[today] = _DayStats()
+        stats.add(pnl)
         
         # Log trade exit
         self.logger.info("")
@@ -157,41 +206,43 @@ class PnLLogger:
         self.logger.info("=" * 80)
         
         # Log daily summary
-        self._log_daily_summary()
+        self._log_daily_summary(today)
     
-    def _log_daily_summary(self):
-        """Log daily P&L summary."""
-        today = date.today().isoformat()
-        
-        if today not in self.daily_trades or not self.daily_trades[today]:
+    def _today(self) -> str:
+        """Local date as 'YYYY-MM-DD', rebuilt only when the day rolls over."""
+        if time.time() >= self._day_ends_at:
+            today = date.today()
+            self._today_str = today.isoformat()
+            self._day_ends_at = datetime.combine(today + timedelta(days=1), datetime.min.time()).timestamp()
+        return self._today_str
+    
+    def _log_daily_summary(self, day: str):
+        """Log the P&L summary for a day ('YYYY-MM-DD') from its running totals."""
+        stats = self._stats_by_day.get(day)
+        if stats is None or not stats.trades:
             return
         
-        trades = self.daily_trades[today]
-        total_pnl = sum(trades)
-        num_trades = len(trades)
-        wins = sum(1 for pnl in trades if pnl > 0)
-        losses = sum(1 for pnl in trades if pnl < 0)
+        total_pnl = stats.total_pnl
+        num_trades = stats.trades
+        wins = stats.wins
+        losses = stats.losses
         win_rate = (wins / num_trades * 100) if num_trades > 0 else 0
         
-        avg_win = sum(pnl for pnl in trades if pnl > 0) / wins if wins > 0 else 0
-        avg_loss = sum(pnl for pnl in trades if pnl < 0) / losses if losses > 0 else 0
-        
-        self.logger.info("")
-        self.logger.info("┌" + "─" * 78 + "┐")
-        self.logger.info("│" + " " * 25 + f"DAILY SUMMARY - {today}" + " " * 26 + "│")
-        self.logger.info("├" + "─" * 78 + "┤")
-        self.logger.info(f"│  Total P&L:      ${total_pnl:+,.2f}" + " " * (54 - len(f"${total_pnl:+,.2f}")) + "│")
-        self.logger.info(f"│  Total Trades:   {num_trades}" + " " * (64 - len(str(num_trades))) + "│")
-        self.logger.info(f"│  Wins:           {wins} ({win_rate:.1f}%)" + " " * (56 - len(f"{wins} ({win_rate:.1f}%)")) + "│")
-        self.logger.info(f"│  Losses:         {losses}" + " " * (64 - len(str(losses))) + "│")
-        
+        averages = ""
         if wins > 0:
-            self.logger.info(f"│  Avg Win:        ${avg_win:,.2f}" + " " * (54 - len(f"${avg_win:,.2f}")) + "│")
+            averages += _SUMMARY_ROW.format(label="Avg Win:", value=f"${stats.win_sum / wins:,.2f}")
         if losses > 0:
-            self.logger.info(f"│  Avg Loss:       ${avg_loss:,.2f}" + " " * (54 - len(f"${avg_loss:,.2f}")) + "│")
+            averages += _SUMMARY_ROW.format(label="Avg Loss:", value=f"${stats.loss_sum / losses:,.2f}")
         
-        self.logger.info("└" + "─" * 78 + "┘")
-        self.logger.info("")
+        # One record: the box starts on its own line so its rows stay aligned
+        self.logger.info(_SUMMARY_BOX.format(
+            title=f"DAILY SUMMARY - {day}",
+            total=f"${total_pnl:+,.2f}",
+            trades=num_trades,
+            wins=f"{wins} ({win_rate:.1f}%)",
+            losses=losses,
+            averages=averages
+        ))
     
     def log_manual_summary(self, date_str: Optional[str] = None):
         """
@@ -201,13 +252,13 @@ class PnLLogger:
             date_str: Date in 'YYYY-MM-DD' format. If None, uses today.
         """
         if date_str is None:
-            date_str = date.today().isoformat()
+            date_str = self._today()
         
-        if date_str not in self.daily_trades:
+        if date_str not in self._stats_by_day:
             self.logger.info(f"No trades recorded for {date_str}")
             return
         
-        self._log_daily_summary()
+        self._log_daily_summary(date_str)
 
 
 # Convenience function for testing
@@ -3,12 +3,12 @@ Trading Profiles Configuration
 Defines risk/reward parameters per user profile
 """
 from dataclasses import dataclass
-from typing import Dict
+from typing import Dict, Final
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class TradingProfile:
-    """Trading profile configuration."""
+    """Trading profile configuration (immutable; shared by every engine)."""
     name: str
     combination_method: str
     min_confidence: float
@@ -17,8 +17,8 @@ class TradingProfile:
     description: str
 
 
-# Profile definitions
-PROFILES: Dict[str, TradingProfile] = {
+# Profile definitions (keys are lowercase; get_profile lowercases the name)
+PROFILES: Final[Dict[str, TradingProfile]] = {
     "conservative": TradingProfile(
         name="Conservative",
         combination_method="consensus",
@@ -53,6 +53,8 @@ PROFILES: Dict[str, TradingProfile] = {
     )
 }
 
+_DEFAULT_PROFILE: Final[TradingProfile] = PROFILES["conservative"]
+
 
 def get_profile(name: str) -> TradingProfile:
     """
@@ -64,8 +66,7 @@ def get_profile(name: str) -> TradingProfile:
     Returns:
         TradingProfile instance (defaults to conservative if invalid)
     """
-    profile = PROFILES.get(name.lower(), PROFILES["conservative"])
-    return profile
+    return PROFILES.get(name.lower(), _DEFAULT_PROFILE)
 
 
 def list_profiles() -> Dict[str, str]:
@@ -7,11 +7,24 @@ import numpy as np
 from dataclasses import dataclass
 from typing import Optional
 import logging
+import math
+
+from apps.analytics.indicators import last_average_true_range
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+def _last_atr(df, period: int) -> float:
+    """ATR of the newest bar from the high/low/close columns (DataFrame or CandleBuffer), no copies."""
+    return last_average_true_range(
+        np.asarray(df['high'], dtype=np.float64),
+        np.asarray(df['low'], dtype=np.float64),
+        np.asarray(df['close'], dtype=np.float64),
+        period
+    )
+
+
+@dataclass(slots=True)
 class RiskConfig:
     """Risk management configuration parameters."""
     max_account_risk_per_trade: float = 0.02  # Never risk more than 2% per trade (Layer over Kelly)
@@ -28,7 +41,7 @@ class RiskConfig:
     max_volatility_threshold: float = 0.05    # 5% ATR threshold
 
 
-@dataclass
+@dataclass(slots=True)
 class PortfolioRiskConfig(RiskConfig):
     """
     Extended risk config for portfolio-level management.
@@ -66,6 +79,7 @@ class ProfessionalRiskManager:
     - Notional value validation
     - ATR-based dynamic stop losses
     """
+    __slots__ = ('cfg', 'current_daily_loss', '_max_dd', '_min_notional', '_kelly_fraction', '_max_risk')
     
     def __init__(self, config: RiskConfig, current_daily_pnl: float = 0.0):
         """
@@ -78,6 +92,12 @@ class ProfessionalRiskManager:
         self.cfg = config
         self.current_daily_loss = current_daily_pnl  # Must be updated from accounting system
         
+        # Sizing limits read on every calculate_safe_size call
+        self._max_dd = config.max_daily_drawdown
+        self._min_notional = config.min_notional_usdt
+        self._kelly_fraction = config.kelly_fraction
+        self._max_risk = config.max_account_risk_per_trade
+        
     def update_daily_pnl(self, pnl: float):
         """Update current daily P&L."""
         self.current_daily_loss = pnl
@@ -106,11 +126,11 @@ class ProfessionalRiskManager:
         """
         
         # 1. Circuit Breaker: Daily Drawdown
-        max_daily_loss = balance * self.cfg.max_daily_drawdown
+        max_daily_loss = balance * self._max_dd
         if self.current_daily_loss <= -max_daily_loss:
             logger.warning(
-                f"️ KILL SWITCH ACTIVATED: Daily loss limit reached "
-                f"({self.current_daily_loss:.2f} / -{max_daily_loss:.2f})"
+                "️ KILL SWITCH ACTIVATED: Daily loss limit reached (%.2f / -%.2f)",
+                self.current_daily_loss, max_daily_loss
             )
             return 0.0
 
@@ -120,17 +140,15 @@ class ProfessionalRiskManager:
             return 0.0
             
         kelly_pct = win_rate - ((1 - win_rate) / reward_ratio)
-        kelly_pct = max(0, kelly_pct) * self.cfg.kelly_fraction
-        
-        logger.debug(f"Kelly %: {kelly_pct:.4f} (fractional: {self.cfg.kelly_fraction})")
+        kelly_pct = max(0, kelly_pct) * self._kelly_fraction
         
         # 3. Hard Risk Cap (The safety net)
         # Even if Kelly says 20%, if our hard cap is 2%, we use 2%.
-        position_size_equity_pct = min(kelly_pct, self.cfg.max_account_risk_per_trade)
+        position_size_equity_pct = min(kelly_pct, self._max_risk)
         
         logger.debug(
-            f"Position size %: {position_size_equity_pct:.4f} "
-            f"(capped at {self.cfg.max_account_risk_per_trade})"
+            "Kelly %%: %.4f (fractional: %s) | Position size %%: %.4f (capped at %s)",
+            kelly_pct, self._kelly_fraction, position_size_equity_pct, self._max_risk
         )
         
         # 4. Size Calculation Based on Risk Amount (Distance to Stop Loss)
@@ -144,27 +162,63 @@ class ProfessionalRiskManager:
         quantity_asset = risk_amount_usdt / risk_per_share
         
         logger.debug(
-            f"Risk amount: ${risk_amount_usdt:.2f} | "
-            f"Risk per unit: ${risk_per_share:.2f} | "
-            f"Quantity: {quantity_asset:.6f}"
+            "Risk amount: $%.2f | Risk per unit: $%.2f | Quantity: %.6f",
+            risk_amount_usdt, risk_per_share, quantity_asset
         )
         
         # 5. Notional Value Validation (Binance requirement)
         notional_value = quantity_asset * entry_price
-        if notional_value < self.cfg.min_notional_usdt:
+        if notional_value < self._min_notional:
             logger.warning(
-                f"️ Order rejected: Notional value {notional_value:.2f} < "
-                f"{self.cfg.min_notional_usdt} USDT minimum"
+                "️ Order rejected: Notional value %.2f < %s USDT minimum",
+                notional_value, self._min_notional
             )
             return 0.0
         
         logger.info(
-            f"[OK] Position approved: {quantity_asset:.6f} units @ ${entry_price:.2f} "
-            f"(notional: ${notional_value:.2f}, SL: ${stop_loss_price:.2f})"
+            "[OK] Position approved: %.6f units @ $%.2f (notional: $%.2f, SL: $%.2f)",
+            quantity_asset, entry_price, notional_value, stop_loss_price
         )
         
         return quantity_asset
 
+    def calculate_safe_size_batch(
+        self,
+        balance: float,
+        entry_price: np.ndarray,
+        stop_loss_price: np.ndarray,
+        win_rate: np.ndarray,
+        reward_ratio: np.ndarray
+    ) -> np.ndarray:
+        """
+        calculate_safe_size for N candidates at once (one array element per symbol).
+
+        Same rules without the per-candidate logging: a blocked candidate
+        (zero reward ratio, entry == stop loss, notional below the minimum)
+        gets 0.0, and the daily kill switch zeroes the whole batch.
+
+        Returns:
+            Position sizes in base currency, one per candidate
+        """
+        entry_price = np.asarray(entry_price, dtype=np.float64)
+        if self.current_daily_loss <= -balance * self._max_dd:
+            logger.warning(
+                "️ KILL SWITCH ACTIVATED: Daily loss limit reached (%.2f / -%.2f)",
+                self.current_daily_loss, balance * self._max_dd
+            )
+            return np.zeros_like(entry_price)
+
+        win_rate = np.asarray(win_rate, dtype=np.float64)
+        reward_ratio = np.asarray(reward_ratio, dtype=np.float64)
+        risk_per_share = np.abs(entry_price - np.asarray(stop_loss_price, dtype=np.float64))
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            kelly_pct = np.maximum(0.0, win_rate - (1.0 - win_rate) / reward_ratio) * self._kelly_fraction
+            quantity = balance * np.minimum(kelly_pct, self._max_risk) / risk_per_share
+
+        approved = (reward_ratio != 0) & (risk_per_share != 0) & (quantity * entry_price >= self._min_notional)
+        return np.where(approved, quantity, 0.0)
+
     def validate_volatility(
         self,
         df: pd.DataFrame,
@@ -174,33 +228,33 @@ class ProfessionalRiskManager:
         Prevent trading if market is TOO crazy (e.g., flash crash).
         
         Args:
-            df: DataFrame with OHLC data
+            df: OHLC data with 'high', 'low', 'close' columns (DataFrame or CandleBuffer)
             threshold_atr_pct: Maximum acceptable volatility (defaults to config value)
             
         Returns:
             True if volatility is acceptable, False otherwise
         """
-        if df.empty or len(df) < 1:
+        if len(df) < 1:
             logger.warning("Cannot validate volatility: insufficient data")
             return False
         
         threshold = threshold_atr_pct or self.cfg.max_volatility_threshold
         
-        # Calculate simple ATR percentage of last candle
-        last_close = df['close'].iloc[-1]
-        last_high = df['high'].iloc[-1]
-        last_low = df['low'].iloc[-1]
+        # Calculate simple ATR percentage of last candle (scalars straight from the arrays)
+        last_close = float(np.asarray(df['close'])[-1])
+        last_high = float(np.asarray(df['high'])[-1])
+        last_low = float(np.asarray(df['low'])[-1])
         
         tr_pct = (last_high - last_low) / last_close
         
         if tr_pct > threshold:
             logger.warning(
-                f"️ Market too volatile ({tr_pct:.2%} > {threshold:.2%}). "
-                f"Operation cancelled for safety."
+                "️ Market too volatile (%.2f%% > %.2f%%). Operation cancelled for safety.",
+                tr_pct * 100, threshold * 100
             )
             return False
         
-        logger.debug(f"Volatility check passed: {tr_pct:.2%}")
+        logger.debug("Volatility check passed: %.2f%%", tr_pct * 100)
         return True
 
     def calculate_dynamic_stop_loss(
@@ -218,7 +272,7 @@ class ProfessionalRiskManager:
         to avoid 'stop hunts'.
         
         Args:
-            df: DataFrame with OHLC data (must have 'high', 'low', 'close')
+            df: OHLC data with 'high', 'low', 'close' columns (DataFrame or CandleBuffer)
             current_price: Current market price
             atr_period: ATR period (defaults to config)
             multiplier: ATR multiplier (defaults to config)
@@ -235,30 +289,18 @@ class ProfessionalRiskManager:
             fallback_pct = 0.95 if side == 'long' else 1.05
             stop_loss = current_price * fallback_pct
             logger.warning(
-                f"Insufficient data for ATR ({len(df)} < {atr_period}). "
-                f"Using {abs(1-fallback_pct):.1%} fallback SL: ${stop_loss:.2f}"
+                "Insufficient data for ATR (%d < %d). Using %.1f%% fallback SL: $%.2f",
+                len(df), atr_period, abs(1 - fallback_pct) * 100, stop_loss
             )
             return stop_loss
 
-        # Calculate True Range
-        df = df.copy()  # Avoid SettingWithCopyWarning
-        df['tr'] = np.maximum(
-            df['high'] - df['low'],
-            np.maximum(
-                abs(df['high'] - df['close'].shift(1)),
-                abs(df['low'] - df['close'].shift(1))
-            )
-        )
-        
-        # Calculate ATR
-        atr = df['tr'].rolling(window=atr_period).mean().iloc[-1]
+        # Calculate ATR (simple mean of true range) with the compiled kernel
+        atr = _last_atr(df, atr_period)
         
-        if pd.isna(atr) or atr <= 0:
+        if math.isnan(atr) or atr <= 0:
             fallback_pct = 0.95 if side == 'long' else 1.05
             stop_loss = current_price * fallback_pct
-            logger.warning(
-                f"Invalid ATR value ({atr}). Using fallback SL: ${stop_loss:.2f}"
-            )
+            logger.warning("Invalid ATR value (%s). Using fallback SL: $%.2f", atr, stop_loss)
             return stop_loss
         
         # Calculate stop loss
@@ -268,8 +310,8 @@ class ProfessionalRiskManager:
             stop_loss = current_price + (atr * multiplier)
         
         logger.info(
-            f"ATR-based SL calculated: ${stop_loss:.2f} "
-            f"(ATR: ${atr:.2f}, multiplier: {multiplier}x, side: {side})"
+            "ATR-based SL calculated: $%.2f (ATR: $%.2f, multiplier: %sx, side: %s)",
+            stop_loss, atr, multiplier, side
         )
         
         return stop_loss
@@ -286,6 +328,7 @@ class PortfolioRiskManager(ProfessionalRiskManager):
     
     Critical for multi-symbol trading to avoid correlated losses.
     """
+    __slots__ = ('active_positions', '_exposure_total', '_correlated')
     
     def __init__(self, config: PortfolioRiskConfig, current_daily_pnl: float = 0.0):
         """
@@ -298,6 +341,10 @@ class PortfolioRiskManager(ProfessionalRiskManager):
         super().__init__(config, current_daily_pnl)
         self.cfg: PortfolioRiskConfig = config  # Type hint for IDE
         self.active_positions: dict = {}  # {symbol: position_size_usd}
+        self._exposure_total = 0.0  # sum(active_positions.values()), kept up to date
+        self._correlated = {
+            symbol: frozenset(peers) for symbol, peers in config.correlation_matrix.items()
+        }
     
     def can_open_position(
         self,
@@ -321,8 +368,7 @@ class PortfolioRiskManager(ProfessionalRiskManager):
             (approved, reason)
         """
         # Check 1: Total exposure
-        current_exposure = sum(self.active_positions.values())
-        new_exposure = current_exposure + position_size_usd
+        new_exposure = self._exposure_total + position_size_usd
         max_exposure = account_balance * self.cfg.max_total_exposure
         
         if new_exposure > max_exposure:
@@ -330,26 +376,25 @@ class PortfolioRiskManager(ProfessionalRiskManager):
                 f"Total exposure would be ${new_exposure:.2f} "
                 f"> ${max_exposure:.2f} ({self.cfg.max_total_exposure*100}%)"
             )
-            logger.warning(f" {symbol} - Portfolio REJECTED: {reason}")
+            logger.warning(" %s - Portfolio REJECTED: %s", symbol, reason)
             return False, reason
         
         # Check 2: Correlated positions
-        correlated_symbols = self.cfg.correlation_matrix.get(symbol, [])
-        correlated_open = sum(
-            1 for s in correlated_symbols if s in self.active_positions
-        )
+        correlated = self._correlated.get(symbol)
+        correlated_open = len(self.active_positions.keys() & correlated) if correlated else 0
         
         if correlated_open >= self.cfg.max_correlated_positions:
+            correlated_symbols = self.cfg.correlation_matrix[symbol]
             reason = (
                 f"{symbol} correlates with {correlated_open} open positions: "
                 f"{[s for s in correlated_symbols if s in self.active_positions]}"
             )
-            logger.warning(f" {symbol} - Portfolio REJECTED: {reason}")
+            logger.warning(" %s - Portfolio REJECTED: %s", symbol, reason)
             return False, reason
         
         logger.info(
-            f"[OK] {symbol} - Portfolio approved "
-            f"(exposure: ${new_exposure:.2f}/{max_exposure:.2f})"
+            "[OK] %s - Portfolio approved (exposure: $%.2f/%.2f)",
+            symbol, new_exposure, max_exposure
         )
         return True, "OK"
     
@@ -361,11 +406,11 @@ class PortfolioRiskManager(ProfessionalRiskManager):
             symbol: Trading pair
             size_usd: Position size in USD
         """
+        self._exposure_total += size_usd - self.active_positions.get(symbol, 0.0)
         self.active_positions[symbol] = size_usd
-        total = sum(self.active_positions.values())
         logger.info(
-            f"Position registered: {symbol} @ ${size_usd:.2f} "
-            f"(total exposure: ${total:.2f})"
+            "Position registered: %s @ $%.2f (total exposure: $%.2f)",
+            symbol, size_usd, self._exposure_total
         )
     
     def close_position(self, symbol: str):
@@ -377,7 +422,9 @@ class PortfolioRiskManager(ProfessionalRiskManager):
         """
         if symbol in self.active_positions:
             size = self.active_positions.pop(symbol)
-            logger.info(f"Position closed: {symbol} (was ${size:.2f})")
+            # Reset when flat so float drift in the running total cannot build up
+            self._exposure_total = self._exposure_total - size if self.active_positions else 0.0
+            logger.info("Position closed: %s (was $%.2f)", symbol, size)
     
     def calculate_atr_normalized_size(
         self,
@@ -415,26 +462,17 @@ class PortfolioRiskManager(ProfessionalRiskManager):
         
         if len(df) < atr_period:
             logger.warning(
-                f"{symbol}: Insufficient data for ATR ({len(df)} < {atr_period}), "
-                f"using fallback sizing"
+                "%s: Insufficient data for ATR (%d < %d), using fallback sizing",
+                symbol, len(df), atr_period
             )
             # Fallback: simple percentage of balance
             return (max_risk_usd / current_price)
         
-        # Calculate True Range
-        df = df.copy()
-        df['tr'] = np.maximum(
-            df['high'] - df['low'],
-            np.maximum(
-                abs(df['high'] - df['close'].shift(1)),
-                abs(df['low'] - df['close'].shift(1))
-            )
-        )
-        
-        atr = df['tr'].rolling(window=atr_period).mean().iloc[-1]
+        # Calculate ATR (simple mean of true range) with the compiled kernel
+        atr = _last_atr(df, atr_period)
         
-        if pd.isna(atr) or atr <= 0:
-            logger.warning(f"{symbol}: Invalid ATR ({atr}), using fallback")
+        if math.isnan(atr) or atr <= 0:
+            logger.warning("%s: Invalid ATR (%s), using fallback", symbol, atr)
             return (max_risk_usd / current_price)
         
         # Normalize by ATR
@@ -442,9 +480,8 @@ class PortfolioRiskManager(ProfessionalRiskManager):
         position_size = max_risk_usd / (atr * atr_multiplier)
         
         logger.info(
-            f"{symbol} - ATR Sizing: "
-            f"ATR=${atr:.4f}, Risk=${max_risk_usd:.2f}, "
-            f"Size={position_size:.6f} units"
+            "%s - ATR Sizing: ATR=$%.4f, Risk=$%.2f, Size=%.6f units",
+            symbol, atr, max_risk_usd, position_size
         )
         
         return position_size
@@ -454,6 +491,7 @@ class PortfolioRiskManager(ProfessionalRiskManager):
 # Backward compatibility: Keep old RiskManager as alias
 class RiskManager(ProfessionalRiskManager):
     """Deprecated: Use ProfessionalRiskManager instead."""
+    __slots__ = ('leverage', 'win_rate', 'ratio')
     
     def __init__(self, leverage: int = 1, strategy_win_rate: float = 0.55, profit_loss_ratio: float = 1.5):
         """
@@ -5,9 +5,11 @@ from abc import ABC, abstractmethod
 from typing import Optional
 from dataclasses import dataclass
 from enum import Enum
-import pandas as pd
+import numpy as np
 import logging
 
+from apps.executor.candle_buffer import CandleBuffer
+
 logger = logging.getLogger(__name__)
 
 
@@ -72,6 +74,9 @@ class BaseStrategy(ABC):
     All strategies must implement:
     - generate_signal(): Analyze data and return a trading signal
     - get_required_candles(): Return minimum number of candles needed
+    
+    Signal generation is synchronous and runs on the engine's event loop,
+    so strategies must not do I/O.
     """
     
     def __init__(self, name: str):
@@ -86,12 +91,12 @@ class BaseStrategy(ABC):
         self.logger = logging.getLogger(f"{__name__}.{name}")
     
     @abstractmethod
-    async def generate_signal(self, df: pd.DataFrame) -> Optional[Signal]:
+    def generate_signal(self, candles: CandleBuffer) -> Optional[Signal]:
         """
         Analyze market data and generate trading signal.
         
         Args:
-            df: DataFrame with OHLCV data (columns: open, high, low, close, volume)
+            candles: OHLCV arrays (open, high, low, close, volume)
             
         Returns:
             Signal object or None if not enough data
@@ -108,57 +113,48 @@ class BaseStrategy(ABC):
         """
         pass
     
-    def validate_dataframe(self, df: pd.DataFrame) -> bool:
+    def validate_candles(self, candles: CandleBuffer) -> bool:
         """
-        Validate that DataFrame has required columns and enough data.
+        Validate that there are enough candles and no missing values.
         
         Args:
-            df: DataFrame to validate
+            candles: OHLCV arrays to validate
             
         Returns:
             True if valid, False otherwise
         """
-        required_columns = ['open', 'high', 'low', 'close', 'volume']
-        
-        # Check columns
-        if not all(col in df.columns for col in required_columns):
-            self.logger.error(
-                f"DataFrame missing required columns. "
-                f"Expected: {required_columns}, Got: {list(df.columns)}"
-            )
-            return False
-        
         # Check data length
-        if len(df) < self.get_required_candles():
+        if len(candles) < self.get_required_candles():
             self.logger.warning(
-                f"Insufficient data: {len(df)} candles < "
+                f"Insufficient data: {len(candles)} candles < "
                 f"{self.get_required_candles()} required"
             )
             return False
         
         # Check for NaN values
-        if df[required_columns].isnull().any().any():
-            self.logger.warning("DataFrame contains NaN values")
-            return False
+        for column in (candles.open, candles.high, candles.low, candles.close, candles.volume):
+            if np.isnan(column).any():
+                self.logger.warning("Candles contain NaN values")
+                return False
         
         return True
     
-    async def analyze(self, df: pd.DataFrame) -> Optional[Signal]:
+    def analyze(self, candles: CandleBuffer) -> Optional[Signal]:
         """
         Public method to analyze data and generate signal.
         Includes validation and logging.
         
         Args:
-            df: DataFrame with OHLCV data
+            candles: OHLCV arrays
             
         Returns:
             Signal object or None
         """
-        if not self.validate_dataframe(df):
+        if not self.validate_candles(candles):
             return None
         
         try:
-            signal = await self.generate_signal(df)
+            signal = self.generate_signal(candles)
             
             if signal:
                 self.signals_generated += 1
@@ -3,9 +3,10 @@ Mean Reversion Strategy - Bollinger Bands + RSI
 Trades on the assumption that price will return to the mean.
 """
 from typing import Optional
-import pandas as pd
 import numpy as np
 
+from apps.analytics.indicators import last_mean_std, last_simple_rsi, rolling_mean_std, simple_rsi
+from apps.executor.candle_buffer import CandleBuffer
 from .base_strategy import BaseStrategy, Signal, SignalType
 
 
@@ -52,49 +53,37 @@ class MeanReversionStrategy(BaseStrategy):
         """Need enough candles for BB + RSI."""
         return max(self.bb_period, self.rsi_period) + 5
     
-    def calculate_rsi(self, df: pd.DataFrame) -> pd.Series:
-        """Calculate RSI indicator."""
-        delta = df['close'].diff()
-        
-        gain = (delta.where(delta > 0, 0)).rolling(window=self.rsi_period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=self.rsi_period).mean()
-        
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        
-        return rsi
+    def calculate_rsi(self, close: np.ndarray) -> np.ndarray:
+        """Calculate RSI indicator (simple rolling means of gains/losses)."""
+        return simple_rsi(close, self.rsi_period)
     
-    def calculate_bollinger_bands(self, df: pd.DataFrame) -> tuple:
+    def calculate_bollinger_bands(self, close: np.ndarray) -> tuple:
         """
         Calculate Bollinger Bands.
         
         Returns:
             (middle_band, upper_band, lower_band)
         """
-        middle_band = df['close'].rolling(window=self.bb_period).mean()
-        std = df['close'].rolling(window=self.bb_period).std()
+        middle_band, std = rolling_mean_std(close, self.bb_period)
         
         upper_band = middle_band + (std * self.bb_std)
         lower_band = middle_band - (std * self.bb_std)
         
         return middle_band, upper_band, lower_band
     
-    async def generate_signal(self, df: pd.DataFrame) -> Optional[Signal]:
+    def generate_signal(self, candles: CandleBuffer) -> Optional[Signal]:
         """Generate mean reversion trading signal."""
+        close = candles.close
         
-        # Calculate indicators
-        df['rsi'] = self.calculate_rsi(df)
-        df['bb_middle'], df['bb_upper'], df['bb_lower'] = self.calculate_bollinger_bands(df)
-        
-        # Get latest values
-        current_price = df['close'].iloc[-1]
-        current_rsi = df['rsi'].iloc[-1]
-        bb_middle = df['bb_middle'].iloc[-1]
-        bb_upper = df['bb_upper'].iloc[-1]
-        bb_lower = df['bb_lower'].iloc[-1]
+        # Only the latest indicator values are used, so read just their windows
+        current_price = float(close[-1])
+        current_rsi = last_simple_rsi(close, self.rsi_period)
+        bb_middle, bb_std = last_mean_std(close, self.bb_period)
+        bb_upper = bb_middle + bb_std * self.bb_std
+        bb_lower = bb_middle - bb_std * self.bb_std
         
         # Check for NaN
-        if any(pd.isna(val) for val in [current_rsi, bb_middle, bb_upper, bb_lower]):
+        if np.isnan([current_rsi, bb_middle, bb_upper, bb_lower]).any():
             self.logger.warning("Indicators contain NaN values")
             return None
         
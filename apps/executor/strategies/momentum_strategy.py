@@ -3,9 +3,10 @@ Momentum Strategy - RSI + Moving Average Crossover
 Generates buy signals when momentum is positive, sell when negative.
 """
 from typing import Optional
-import pandas as pd
 import numpy as np
 
+from apps.analytics.indicators import last_mean, last_simple_rsi, simple_rsi
+from apps.executor.candle_buffer import CandleBuffer
 from .base_strategy import BaseStrategy, Signal, SignalType
 
 
@@ -56,17 +57,9 @@ class MomentumStrategy(BaseStrategy):
         """Need enough candles for slow MA + RSI."""
         return max(self.slow_ma_period, self.rsi_period) + 5
     
-    def calculate_rsi(self, df: pd.DataFrame) -> pd.Series:
-        """Calculate RSI indicator."""
-        delta = df['close'].diff()
-        
-        gain = (delta.where(delta > 0, 0)).rolling(window=self.rsi_period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=self.rsi_period).mean()
-        
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        
-        return rsi
+    def calculate_rsi(self, close: np.ndarray) -> np.ndarray:
+        """Calculate RSI indicator (simple rolling means of gains/losses)."""
+        return simple_rsi(close, self.rsi_period)
     
     def detect_crossover(self, fast_ma: float, slow_ma: float) -> Optional[str]:
         """
@@ -103,22 +96,18 @@ class MomentumStrategy(BaseStrategy):
         
         return crossover
     
-    async def generate_signal(self, df: pd.DataFrame) -> Optional[Signal]:
+    def generate_signal(self, candles: CandleBuffer) -> Optional[Signal]:
         """Generate momentum-based trading signal."""
+        close = candles.close
         
-        # Calculate indicators
-        df['rsi'] = self.calculate_rsi(df)
-        df['fast_ma'] = df['close'].rolling(window=self.fast_ma_period).mean()
-        df['slow_ma'] = df['close'].rolling(window=self.slow_ma_period).mean()
-        
-        # Get latest values
-        current_price = df['close'].iloc[-1]
-        current_rsi = df['rsi'].iloc[-1]
-        fast_ma = df['fast_ma'].iloc[-1]
-        slow_ma = df['slow_ma'].iloc[-1]
+        # Only the latest indicator values are used, so read just their windows
+        current_price = float(close[-1])
+        current_rsi = last_simple_rsi(close, self.rsi_period)
+        fast_ma = last_mean(close, self.fast_ma_period)
+        slow_ma = last_mean(close, self.slow_ma_period)
         
         # Check for NaN
-        if pd.isna(current_rsi) or pd.isna(fast_ma) or pd.isna(slow_ma):
+        if np.isnan(current_rsi) or np.isnan(fast_ma) or np.isnan(slow_ma):
             self.logger.warning("Indicators contain NaN values")
             return None
         
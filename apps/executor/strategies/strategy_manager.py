@@ -2,9 +2,10 @@
 Strategy Manager - Manages multiple trading strategies
 """
 from typing import List, Optional, Dict
-import pandas as pd
 import logging
 
+from apps.analytics.indicators import ema
+from apps.executor.candle_buffer import CandleBuffer
 from .base_strategy import BaseStrategy, Signal, SignalType
 from apps.ingestion.sentiment import SentimentAnalyzer
 
@@ -65,12 +66,12 @@ class StrategyManager:
             return 0
         return max(s.get_required_candles() for s in self.strategies)
     
-    async def get_all_signals(self, df: pd.DataFrame) -> Dict[str, Optional[Signal]]:
+    def get_all_signals(self, candles: CandleBuffer) -> Dict[str, Optional[Signal]]:
         """
         Get signals from all registered strategies.
         
         Args:
-            df: DataFrame with OHLCV data
+            candles: OHLCV arrays
             
         Returns:
             Dictionary mapping strategy name to signal
@@ -79,7 +80,7 @@ class StrategyManager:
         
         for strategy in self.strategies:
             try:
-                signal = await strategy.analyze(df)
+                signal = strategy.analyze(candles)
                 signals[strategy.name] = signal
                 
                 # Update stats
@@ -99,16 +100,16 @@ class StrategyManager:
         
         return signals
     
-    async def get_combined_signal(
+    def get_combined_signal(
         self,
-        df: pd.DataFrame,
+        candles: CandleBuffer,
         min_confidence: float = 0.6
     ) -> Optional[Signal]:
         """
         Get combined signal from all strategies.
         
         Args:
-            df: DataFrame with OHLCV data
+            candles: OHLCV arrays
             min_confidence: Minimum confidence threshold
             
         Returns:
@@ -121,9 +122,10 @@ class StrategyManager:
         # Buying during downtrends = bag holding.
         # Block ALL BUY signals when price < EMA 200.
         
-        if len(df) >= 200:
-            ema_200 = df['close'].ewm(span=200, adjust=False).mean().iloc[-1]
-            current_price = df['close'].iloc[-1]
+        if len(candles) >= 200:
+            close = candles.close
+            ema_200 = float(ema(close, 200)[-1])
+            current_price = float(close[-1])
             
             if current_price < ema_200:
                 logger.info(
@@ -138,9 +140,9 @@ class StrategyManager:
         else:
             # Not enough data for EMA 200, be conservative
             self._in_downtrend = False
-            logger.debug(f"[TREND FILTER] Insufficient data for EMA 200 ({len(df)} candles)")
+            logger.debug(f"[TREND FILTER] Insufficient data for EMA 200 ({len(candles)} candles)")
         
-        all_signals = await self.get_all_signals(df)
+        all_signals = self.get_all_signals(candles)
         
         # Filter out None and HOLD signals
         actionable_signals = {
@@ -75,6 +75,9 @@ class MultiSymbolFeedHandler:
         self.zmq_context = zmq.asyncio.Context()
         self.zmq_socket = None
         
+        # Reusable msgpack encoder (avoids building a Packer per tick)
+        self._packer = msgpack.Packer(use_bin_type=True)
+        
         # Metrics per symbol
         self.messages_sent = {symbol: 0 for symbol in self.symbols}
         self.start_time = None
@@ -209,7 +212,7 @@ class MultiSymbolFeedHandler:
         topic = symbol.encode('utf-8')
         
         # Serialize with msgpack (faster than JSON)
-        packed = msgpack.packb(data, use_bin_type=True)
+        packed = self._packer.pack(data)
         
         # Send: [topic, data]
         await self.zmq_socket.send_multipart([topic, packed])
@@ -12,6 +12,12 @@ import websockets
 from typing import Dict, Any, List, Optional, Callable, Set
 from datetime import datetime
 
+try:
+    import orjson
+    _json_loads = orjson.loads  # orjson.JSONDecodeError subclasses json.JSONDecodeError
+except ImportError:
+    _json_loads = json.loads
+
 logger = logging.getLogger(__name__)
 
 
@@ -164,7 +170,7 @@ class BinanceWebSocket:
             async for message in self.websocket:
                 try:
                     # Parse JSON message
-                    data = json.loads(message)
+                    data = _json_loads(message)
                     
                     # Handle combined stream format
                     if 'stream' in data and 'data' in data:
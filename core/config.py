@@ -43,6 +43,10 @@ class Settings(BaseSettings):
     MAX_RISK_PER_TRADE: float = Field(0.02, description="Maximum risk per trade (2% = 0.02)")
     KELLY_FRACTION: float = Field(0.25, description="Kelly criterion fraction (0.25 = quarter Kelly)")
     DEFAULT_LEVERAGE: int = Field(1, description="Default leverage for futures")
+    SIGNAL_CHECK_INTERVAL: float = Field(
+        15.0,
+        description="Max seconds between intrabar signal checks per symbol (0 = every tick)"
+    )
     
     # Trading Symbol
     DEFAULT_SYMBOL: str = Field("BTC/USDT", description="Default trading symbol")